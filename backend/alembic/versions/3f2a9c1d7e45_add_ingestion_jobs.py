@@ -0,0 +1,72 @@
+"""add_ingestion_jobs
+
+Revision ID: 3f2a9c1d7e45
+Revises: 6bcde5592820
+Create Date: 2026-02-02 19:12:04.518233
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f2a9c1d7e45"
+down_revision: Union[str, Sequence[str], None] = "6bcde5592820"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing documents were embedded inline on upload
+    op.add_column(
+        "documents",
+        sa.Column("status", sa.String(), nullable=False, server_default="READY"),
+    )
+    op.alter_column("documents", "status", server_default=None)
+    op.add_column("documents", sa.Column("error", sa.String(), nullable=True))
+
+    op.create_table(
+        "ingestion_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("document_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("run_after", sa.DateTime(), nullable=False),
+        sa.Column("locked_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["document_id"], ["documents.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_ingestion_jobs_id"), "ingestion_jobs", ["id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_ingestion_jobs_document_id"),
+        "ingestion_jobs",
+        ["document_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_ingestion_jobs_status_run_after",
+        "ingestion_jobs",
+        ["status", "run_after"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_ingestion_jobs_status_run_after", table_name="ingestion_jobs")
+    op.drop_index(op.f("ix_ingestion_jobs_document_id"), table_name="ingestion_jobs")
+    op.drop_index(op.f("ix_ingestion_jobs_id"), table_name="ingestion_jobs")
+    op.drop_table("ingestion_jobs")
+
+    op.drop_column("documents", "error")
+    op.drop_column("documents", "status")
@@ -0,0 +1,31 @@
+"""add_page_number_to_document_chunks
+
+Revision ID: 8d41b7e2c6a9
+Revises: 3f2a9c1d7e45
+Create Date: 2026-02-04 10:31:47.220915
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d41b7e2c6a9"
+down_revision: Union[str, Sequence[str], None] = "3f2a9c1d7e45"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "document_chunks", sa.Column("page_number", sa.Integer(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("document_chunks", "page_number")
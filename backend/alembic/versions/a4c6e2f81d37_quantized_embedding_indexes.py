@@ -0,0 +1,28 @@
+"""quantized_embedding_indexes
+
+Revision ID: a4c6e2f81d37
+Revises: e91c4b27d5f3
+Create Date: 2026-02-20 10:41:12.582903
+
+"""
+
+from typing import Sequence, Union
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c6e2f81d37"
+down_revision: Union[str, Sequence[str], None] = "e91c4b27d5f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Intentionally empty: the schema must not depend on the environment
+    # that runs the migrations. The default full float32 HNSW indexes are
+    # kept; switching to a truncated or quantized VECTOR_INDEX_MODE is done
+    # with `python -m src.cli rebuild-index`, and the API refuses to start
+    # while the live indexes do not match the settings.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
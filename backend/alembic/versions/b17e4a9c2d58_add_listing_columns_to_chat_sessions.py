@@ -0,0 +1,76 @@
+"""add_listing_columns_to_chat_sessions
+
+Revision ID: b17e4a9c2d58
+Revises: f2b8d5c3a619
+Create Date: 2026-02-26 11:52:09.638214
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b17e4a9c2d58"
+down_revision: Union[str, Sequence[str], None] = "f2b8d5c3a619"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("chat_sessions", sa.Column("title", sa.String(), nullable=True))
+    op.add_column(
+        "chat_sessions", sa.Column("last_message", sa.String(), nullable=True)
+    )
+    op.add_column("chat_sessions", sa.Column("last_role", sa.String(), nullable=True))
+    op.add_column(
+        "chat_sessions",
+        sa.Column(
+            "last_activity", sa.DateTime(), nullable=False, server_default=sa.func.now()
+        ),
+    )
+    op.add_column(
+        "chat_sessions",
+        sa.Column("message_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.alter_column("chat_sessions", "last_activity", server_default=None)
+    op.alter_column("chat_sessions", "message_count", server_default=None)
+
+    # One row per existing session, built from its messages
+    op.execute(
+        "WITH stats AS ("
+        " SELECT user_id, session_id, count(*) AS message_count,"
+        " min(created_at) AS created_at, max(id) AS last_id,"
+        " min(id) FILTER (WHERE role = 'USER') AS first_user_id"
+        " FROM messages GROUP BY user_id, session_id"
+        ") "
+        "INSERT INTO chat_sessions (user_id, session_id, title, last_message, "
+        "last_role, last_activity, message_count, created_at, updated_at) "
+        "SELECT stats.user_id, stats.session_id, left(first_msg.content, 100), "
+        "left(last_msg.content, 100), last_msg.role::text, last_msg.created_at, "
+        "stats.message_count, stats.created_at, now() "
+        "FROM stats JOIN messages last_msg ON last_msg.id = stats.last_id "
+        "LEFT JOIN messages first_msg ON first_msg.id = stats.first_user_id "
+        "ON CONFLICT ON CONSTRAINT uq_chat_sessions_user_id_session_id DO UPDATE SET "
+        "title = excluded.title, last_message = excluded.last_message, "
+        "last_role = excluded.last_role, last_activity = excluded.last_activity, "
+        "message_count = excluded.message_count"
+    )
+
+    op.execute(
+        "CREATE INDEX ix_chat_sessions_user_id_last_activity ON chat_sessions "
+        "(user_id, last_activity DESC, id DESC)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_chat_sessions_user_id_last_activity", table_name="chat_sessions")
+    op.drop_column("chat_sessions", "message_count")
+    op.drop_column("chat_sessions", "last_activity")
+    op.drop_column("chat_sessions", "last_role")
+    op.drop_column("chat_sessions", "last_message")
+    op.drop_column("chat_sessions", "title")
@@ -0,0 +1,53 @@
+"""add_document_listing_indexes
+
+Revision ID: c5d1f7a3e802
+Revises: b17e4a9c2d58
+Create Date: 2026-03-02 10:14:37.512904
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d1f7a3e802"
+down_revision: Union[str, Sequence[str], None] = "b17e4a9c2d58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps uploads going while the indexes build; it cannot run
+    # inside the migration's transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_documents_created_at_id",
+            "documents",
+            [sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_documents_user_id_created_at_id",
+            "documents",
+            ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_documents_user_id_created_at_id",
+            table_name="documents",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_documents_created_at_id",
+            table_name="documents",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,53 @@
+"""add_content_hash_to_documents
+
+Revision ID: c7a19d4e5b82
+Revises: b52e0f8a3d17
+Create Date: 2026-02-09 12:05:33.671208
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7a19d4e5b82"
+down_revision: Union[str, Sequence[str], None] = "b52e0f8a3d17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "documents", sa.Column("content_hash", sa.String(length=64), nullable=True)
+    )
+    op.create_index(
+        op.f("ix_documents_content_hash"), "documents", ["content_hash"], unique=False
+    )
+    op.create_index(
+        "ix_documents_user_id_content_hash",
+        "documents",
+        ["user_id", "content_hash"],
+        unique=True,
+    )
+
+    # Documents with identical content now share the same S3 object
+    op.drop_index(op.f("ix_documents_file_key"), table_name="documents")
+    op.create_index(
+        op.f("ix_documents_file_key"), "documents", ["file_key"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_documents_file_key"), table_name="documents")
+    op.create_index(
+        op.f("ix_documents_file_key"), "documents", ["file_key"], unique=True
+    )
+
+    op.drop_index("ix_documents_user_id_content_hash", table_name="documents")
+    op.drop_index(op.f("ix_documents_content_hash"), table_name="documents")
+    op.drop_column("documents", "content_hash")
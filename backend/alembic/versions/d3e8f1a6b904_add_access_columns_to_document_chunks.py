@@ -0,0 +1,92 @@
+"""add_access_columns_to_document_chunks
+
+Revision ID: d3e8f1a6b904
+Revises: c7a19d4e5b82
+Create Date: 2026-02-12 18:22:41.305117
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from src.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "d3e8f1a6b904"
+down_revision: Union[str, Sequence[str], None] = "c7a19d4e5b82"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "documents",
+        sa.Column("is_boe", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.alter_column("documents", "is_boe", server_default=None)
+    op.execute(
+        sa.text(
+            "UPDATE documents SET is_boe = true WHERE file_key LIKE :prefix"
+        ).bindparams(prefix=f"{settings.S3_BOE_FOLDER}/%")
+    )
+
+    # Denormalize ownership and visibility onto chunks
+    op.add_column("document_chunks", sa.Column("user_id", sa.Integer(), nullable=True))
+    op.add_column("document_chunks", sa.Column("is_boe", sa.Boolean(), nullable=True))
+    op.execute(
+        "UPDATE document_chunks SET user_id = documents.user_id, "
+        "is_boe = documents.is_boe "
+        "FROM documents WHERE documents.id = document_chunks.document_id"
+    )
+    op.alter_column("document_chunks", "user_id", nullable=False)
+    op.alter_column("document_chunks", "is_boe", nullable=False)
+    op.create_foreign_key(
+        "document_chunks_user_id_fkey",
+        "document_chunks",
+        "users",
+        ["user_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_index(
+        op.f("ix_document_chunks_user_id"),
+        "document_chunks",
+        ["user_id"],
+        unique=False,
+    )
+
+    # BOE chunks get their own, much smaller, HNSW graph
+    op.execute(
+        "CREATE INDEX document_chunks_boe_embedding_idx ON document_chunks "
+        "USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64) "
+        "WHERE is_boe"
+    )
+
+    # BOE uploads used to skip ingestion: queue the ones without chunks
+    op.execute(
+        "UPDATE documents SET status = 'PENDING' WHERE is_boe AND NOT EXISTS "
+        "(SELECT 1 FROM document_chunks WHERE document_id = documents.id)"
+    )
+    op.execute(
+        sa.text(
+            "INSERT INTO ingestion_jobs (document_id, status, attempts, max_attempts, "
+            "run_after, created_at, updated_at) "
+            "SELECT id, 'QUEUED', 0, :max_attempts, now(), now(), now() "
+            "FROM documents WHERE is_boe AND status = 'PENDING'"
+        ).bindparams(max_attempts=settings.INGESTION_MAX_ATTEMPTS)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("document_chunks_boe_embedding_idx", table_name="document_chunks")
+    op.drop_index(op.f("ix_document_chunks_user_id"), table_name="document_chunks")
+    op.drop_constraint(
+        "document_chunks_user_id_fkey", "document_chunks", type_="foreignkey"
+    )
+    op.drop_column("document_chunks", "is_boe")
+    op.drop_column("document_chunks", "user_id")
+    op.drop_column("documents", "is_boe")
@@ -0,0 +1,47 @@
+"""add_content_tsv_to_document_chunks
+
+Revision ID: e91c4b27d5f3
+Revises: d3e8f1a6b904
+Create Date: 2026-02-15 11:47:09.118452
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e91c4b27d5f3"
+down_revision: Union[str, Sequence[str], None] = "d3e8f1a6b904"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Spanish full-text vector for hybrid (lexical + vector) retrieval
+    op.add_column(
+        "document_chunks",
+        sa.Column(
+            "content_tsv",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('spanish', content)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_document_chunks_content_tsv",
+        "document_chunks",
+        ["content_tsv"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_document_chunks_content_tsv", table_name="document_chunks")
+    op.drop_column("document_chunks", "content_tsv")
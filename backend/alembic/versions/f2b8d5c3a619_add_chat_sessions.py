@@ -0,0 +1,66 @@
+"""add_chat_sessions
+
+Revision ID: f2b8d5c3a619
+Revises: a4c6e2f81d37
+Create Date: 2026-02-24 16:08:37.214590
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b8d5c3a619"
+down_revision: Union[str, Sequence[str], None] = "a4c6e2f81d37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "chat_sessions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("session_id", sa.String(), nullable=False),
+        sa.Column("summary", sa.String(), nullable=True),
+        sa.Column("summarized_until", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id", "session_id", name="uq_chat_sessions_user_id_session_id"
+        ),
+    )
+    op.create_index(op.f("ix_chat_sessions_id"), "chat_sessions", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_chat_sessions_user_id"), "chat_sessions", ["user_id"], unique=False
+    )
+
+    op.add_column(
+        "messages",
+        sa.Column(
+            "model_messages", postgresql.JSONB(astext_type=sa.Text()), nullable=True
+        ),
+    )
+    op.create_index(
+        "ix_messages_user_id_session_id_id",
+        "messages",
+        ["user_id", "session_id", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_messages_user_id_session_id_id", table_name="messages")
+    op.drop_column("messages", "model_messages")
+
+    op.drop_index(op.f("ix_chat_sessions_user_id"), table_name="chat_sessions")
+    op.drop_index(op.f("ix_chat_sessions_id"), table_name="chat_sessions")
+    op.drop_table("chat_sessions")
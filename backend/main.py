@@ -2,15 +2,103 @@ from contextlib import asynccontextmanager
 
 import logfire
 from fastapi import FastAPI
+from google import genai
+from pydantic_ai.providers.google import GoogleProvider
 
-from src.api.routes import auth, chat, documents
+from src.agents.chat_agent.agent import ChatAgent
+from src.agents.summary_agent.agent import SummaryAgent
+from src.api.routes import auth, chat, documents, metrics
+from src.core.cache import TTLCache
 from src.core.config import settings
+from src.core.database import engine, pool_stats
+from src.core.metrics import register_metrics
+from src.core.security import shutdown_hash_executor
+from src.core.vector_index import mismatched_indexes
+from src.repositories.storage_repository import StorageRepository
+from src.services.chat_summarizer import ChatSummarizer
+from src.services.embedding_cache import EmbeddingCache
+from src.services.embedding_service import EmbeddingService
+from src.services.login_rate_limiter import LoginRateLimiter
+from src.services.pdf_extractor import shutdown_executor
+from src.services.retrieval_cache import RetrievalCache
+from src.services.storage_service import StorageService
+from src.services.user_status_cache import UserStatusCache
+from src.workers.ingestion_worker import IngestionWorker
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    if settings.VECTOR_INDEX_CHECK_ON_STARTUP:
+        async with engine.connect() as conn:
+            mismatched = await mismatched_indexes(
+                conn, settings.VECTOR_INDEX_MODE, settings.VECTOR_INDEX_DIMENSIONS
+            )
+        if mismatched:
+            raise RuntimeError(
+                f"HNSW indexes {', '.join(mismatched)} do not match "
+                f"VECTOR_INDEX_MODE={settings.VECTOR_INDEX_MODE} and "
+                f"VECTOR_INDEX_DIMENSIONS={settings.VECTOR_INDEX_DIMENSIONS}; "
+                "run `python -m src.cli rebuild-index`"
+            )
+
+    app.state.storage_repository = StorageRepository()
+    await app.state.storage_repository.start()
+    register_metrics("db_pool", pool_stats)
+    app.state.presigned_url_cache = TTLCache(settings.PRESIGNED_URL_CACHE_SIZE)
+    register_metrics("presigned_url_cache", app.state.presigned_url_cache.stats)
+
+    embedding_cache = None
+    if settings.EMBEDDING_CACHE_ENABLED:
+        embedding_cache = EmbeddingCache()
+        register_metrics("embedding_cache", embedding_cache.stats)
+
+    # One Gemini client (and its connection pool) shared by chat and embeddings
+    genai_client = genai.Client(api_key=settings.GOOGLE_API_KEY)
+    app.state.embedding_service = EmbeddingService(
+        client=genai_client, cache=embedding_cache
+    )
+    google_provider = GoogleProvider(client=genai_client)
+    app.state.chat_agent = ChatAgent(google_provider)
+
+    app.state.chat_summarizer = None
+    if settings.CHAT_SUMMARY_ENABLED:
+        app.state.chat_summarizer = ChatSummarizer(SummaryAgent(google_provider))
+
+    # user id -> is_active, checked for every authenticated request
+    app.state.user_status_cache = None
+    if settings.AUTH_USER_CACHE_ENABLED:
+        app.state.user_status_cache = UserStatusCache()
+        register_metrics("user_status_cache", app.state.user_status_cache.stats)
+
+    app.state.login_rate_limiter = None
+    if settings.LOGIN_RATE_LIMIT_ENABLED:
+        app.state.login_rate_limiter = LoginRateLimiter()
+        register_metrics("login_rate_limiter", app.state.login_rate_limiter.stats)
+
+    app.state.retrieval_cache = None
+    if settings.RETRIEVAL_CACHE_ENABLED:
+        app.state.retrieval_cache = RetrievalCache()
+        register_metrics("retrieval_cache", app.state.retrieval_cache.stats)
+
+    worker = None
+    if settings.INGESTION_WORKER_ENABLED:
+        worker = IngestionWorker(
+            StorageService(app.state.storage_repository),
+            app.state.embedding_service,
+            retrieval_cache=app.state.retrieval_cache,
+        )
+        worker.start()
+
     yield
 
+    if worker:
+        await worker.stop()
+    if app.state.chat_summarizer:
+        await app.state.chat_summarizer.stop()
+    shutdown_executor()
+    shutdown_hash_executor()
+    await app.state.storage_repository.close()
+
 
 logfire.configure(token=settings.LOGFIRE_TOKEN)
 logfire.info("Hello, {place}!", place="Nico")
@@ -26,6 +114,9 @@ app.include_router(
     documents.router, prefix=f"{settings.API_V1_STR}/documents", tags=["documents"]
 )
 app.include_router(chat.router, prefix=f"{settings.API_V1_STR}/chat", tags=["chat"])
+app.include_router(
+    metrics.router, prefix=f"{settings.API_V1_STR}/metrics", tags=["metrics"]
+)
 
 
 @app.get("/")
@@ -9,17 +9,26 @@ from .tools import retrieve_documents
 
 
 class ChatAgent:
-    def __init__(self):
-        self.provider = GoogleProvider(api_key=settings.GOOGLE_API_KEY)
+    def __init__(self, provider: GoogleProvider | None = None):
+        self.provider = provider or GoogleProvider(api_key=settings.GOOGLE_API_KEY)
         self.agent = Agent(
             GoogleModel(provider=self.provider, model_name=settings.MODEL_NAME),
             deps_type=ChatDeps,
         )
         self.agent.tool(retrieve_documents)
 
-        @self.agent.system_prompt
+        # Instructions, unlike system prompts, are sent with every request even
+        # when a message history (or its summary) is provided
+        @self.agent.instructions
         def get_system_prompt(ctx: RunContext[ChatDeps]) -> str:
             return build_system_prompt(ctx)
 
     async def run(self, prompt: str, deps: ChatDeps, message_history: list = []):
         return await self.agent.run(prompt, deps=deps, message_history=message_history)
+
+    def run_stream_events(
+        self, prompt: str, deps: ChatDeps, message_history: list = []
+    ):
+        return self.agent.run_stream_events(
+            prompt, deps=deps, message_history=message_history
+        )
@@ -1,12 +1,17 @@
 from dataclasses import dataclass
 
-from src.domain.models.user import User
-from src.repositories.document_chunk_repository import DocumentChunkRepository
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.domain.schemas.user import CurrentUser
 from src.services.embedding_service import EmbeddingService
+from src.services.retrieval_cache import RetrievalCache
 
 
 @dataclass
 class ChatDeps:
-    user: User
-    chunk_repo: DocumentChunkRepository
+    user: CurrentUser
+    # Each tool call opens its own session, so parallel calls run concurrently
+    session_factory: async_sessionmaker[AsyncSession]
     embedding_service: EmbeddingService
+    retrieval_cache: RetrievalCache | None = None
+    read_session_factory: async_sessionmaker[AsyncSession] | None = None
@@ -1,5 +1,12 @@
+from contextlib import nullcontext
+
 from pydantic_ai import RunContext
 
+from src.core.config import settings
+from src.domain.models.document_chunk import DocumentChunk
+from src.domain.models.user import UserRole
+from src.repositories.document_chunk_repository import DocumentChunkRepository
+
 from .deps import ChatDeps
 
 
@@ -8,8 +15,44 @@ async def retrieve_documents(ctx: RunContext[ChatDeps], query: str) -> str:
     Busca fragmentos de documentos relevantes basados en una consulta.
     Usa esta herramienta cuando necesites información específica de los documentos del usuario.
     """
-    embedding = await ctx.deps.embedding_service.generate_query_embedding(query)
-    chunks = await ctx.deps.chunk_repo.search_similar(embedding, limit=5)
+    user = ctx.deps.user
+    include_boe = user.role in [UserRole.ADMIN, UserRole.BOE]
+    cache = ctx.deps.retrieval_cache
+
+    embedding = cache.get_query_embedding(query) if cache else None
+    if embedding is None:
+        embedding = await ctx.deps.embedding_service.generate_query_embedding(query)
+        if cache:
+            cache.set_query_embedding(query, embedding)
+
+    # Connection held only for the queries, not the embedding call
+    read_session_factory = ctx.deps.read_session_factory or nullcontext
+    async with (
+        ctx.deps.session_factory() as session,
+        read_session_factory() as read_session,
+    ):
+        chunk_repo = DocumentChunkRepository(session, read_session)
+        chunks = None
+        if cache:
+            chunk_ids = cache.get_chunk_ids(
+                user.id, include_boe, settings.RETRIEVAL_MODE, query, embedding
+            )
+            if chunk_ids is not None:
+                chunks = await chunk_repo.get_many_by_ids(chunk_ids)
+                # Some chunks are gone: the cached result is stale
+                if len(chunks) != len(chunk_ids):
+                    chunks = None
+        if chunks is None:
+            chunks = await _search(chunk_repo, user.id, embedding, query, include_boe)
+            if cache:
+                cache.set_chunk_ids(
+                    user.id,
+                    include_boe,
+                    settings.RETRIEVAL_MODE,
+                    query,
+                    embedding,
+                    [chunk.id for chunk in chunks],
+                )
 
     if not chunks:
         return "No se encontraron documentos relevantes."
@@ -18,3 +61,20 @@ async def retrieve_documents(ctx: RunContext[ChatDeps], query: str) -> str:
         [f"Fragmento {i + 1}:\n{chunk.content}" for i, chunk in enumerate(chunks)]
     )
     return context
+
+
+async def _search(
+    chunk_repo: DocumentChunkRepository,
+    user_id: int,
+    embedding: list[float],
+    query: str,
+    include_boe: bool,
+) -> list[DocumentChunk]:
+    if settings.RETRIEVAL_MODE == "hybrid":
+        # Lexical matching catches article numbers and legal references
+        return await chunk_repo.hybrid_search(
+            embedding, query, user_id=user_id, include_boe=include_boe, limit=5
+        )
+    return await chunk_repo.search_similar(
+        embedding, user_id=user_id, include_boe=include_boe, limit=5
+    )
@@ -0,0 +1,27 @@
+from pydantic_ai import Agent
+from pydantic_ai.models.google import GoogleModel
+from pydantic_ai.providers.google import GoogleProvider
+from src.core.config import settings
+from src.domain.models.message import Message
+
+from .prompt import SUMMARY_INSTRUCTIONS, build_summary_prompt
+
+
+class SummaryAgent:
+    """Folds older chat messages into a session's rolling summary."""
+
+    def __init__(self, provider: GoogleProvider | None = None):
+        self.provider = provider or GoogleProvider(api_key=settings.GOOGLE_API_KEY)
+        self.agent = Agent(
+            GoogleModel(provider=self.provider, model_name=settings.MODEL_NAME),
+            instructions=SUMMARY_INSTRUCTIONS,
+        )
+
+    async def summarize(
+        self, previous_summary: str | None, messages: list[Message]
+    ) -> str:
+        transcript = "\n".join(f"{msg.role.value}: {msg.content}" for msg in messages)
+        result = await self.agent.run(
+            build_summary_prompt(previous_summary, transcript)
+        )
+        return str(result.output)
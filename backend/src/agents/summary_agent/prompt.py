@@ -0,0 +1,19 @@
+SUMMARY_INSTRUCTIONS = (
+    "<IDENTITY>"
+    "Resumes conversaciones entre un usuario y un asistente experto en sus documentos."
+    "</IDENTITY>"
+    "<RULES>"
+    "1. Integra el resumen anterior (si lo hay) y los mensajes nuevos en un único resumen.\n"
+    "2. Conserva los hechos, cifras, nombres de documentos, artículos y normas citados, "
+    "las preferencias del usuario y las preguntas que queden pendientes.\n"
+    "3. Omite saludos y repeticiones.\n"
+    "4. Escribe en el idioma de la conversación, en menos de 300 palabras."
+    "</RULES>"
+)
+
+
+def build_summary_prompt(previous_summary: str | None, transcript: str) -> str:
+    return (
+        f"<PREVIOUS_SUMMARY>{previous_summary or ''}</PREVIOUS_SUMMARY>"
+        f"<MESSAGES>{transcript}</MESSAGES>"
+    )
@@ -1,28 +1,68 @@
-from fastapi import Depends, HTTPException, status
+from ipaddress import ip_address, ip_network
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.agents.chat_agent.agent import ChatAgent
 from src.core.config import settings
-from src.core.database import get_db_session
-from src.domain.models.user import User
-from src.domain.schemas.token import TokenData
+from src.core.database import get_db_session, get_read_db_session
+from src.domain.models.user import UserRole
+from src.domain.schemas.user import CurrentUser
+from src.repositories.chat_session_repository import ChatSessionRepository
 from src.repositories.document_chunk_repository import DocumentChunkRepository
 from src.repositories.document_repository import DocumentRepository
+from src.repositories.ingestion_job_repository import IngestionJobRepository
 from src.repositories.message_repository import MessageRepository
 from src.repositories.storage_repository import StorageRepository
 from src.repositories.user_repository import UserRepository
 from src.services.auth_service import AuthService
 from src.services.boe_document_service import BoeDocumentService
 from src.services.chat_service import ChatService
+from src.services.chat_summarizer import ChatSummarizer
 from src.services.document_service import DocumentService
 from src.services.embedding_service import EmbeddingService
+from src.services.login_rate_limiter import LoginRateLimiter
+from src.services.retrieval_cache import RetrievalCache
 from src.services.storage_service import StorageService
 from src.services.user_service import UserService
+from src.services.user_status_cache import UserStatusCache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+_trusted_proxies = [
+    ip_network(proxy, strict=False) for proxy in settings.TRUSTED_PROXIES
+]
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ip_address(host.strip())
+    except ValueError:
+        return False
+    return any(address in network for network in _trusted_proxies)
+
+
+async def get_client_ip(request: Request) -> str | None:
+    """
+    The client's IP address, or None when it cannot be told apart from a
+    proxy's (no TRUSTED_PROXIES configured).
+
+    On requests from a trusted proxy it is the nearest X-Forwarded-For entry
+    that is not itself a trusted proxy; earlier entries are client-supplied.
+    """
+    if not _trusted_proxies or request.client is None:
+        return None
+    host = request.client.host
+    if not _is_trusted_proxy(host):
+        return host
+    forwarded = request.headers.get("x-forwarded-for", "").split(",")
+    for hop in reversed(forwarded):
+        if hop.strip() and not _is_trusted_proxy(hop):
+            return hop.strip()
+    return None
+
 
 # Repositories
 async def get_user_repository(
@@ -33,24 +73,40 @@ async def get_user_repository(
 
 async def get_document_repository(
     session: AsyncSession = Depends(get_db_session),
+    read_session: AsyncSession | None = Depends(get_read_db_session),
 ) -> DocumentRepository:
-    return DocumentRepository(session)
+    return DocumentRepository(session, read_session)
 
 
 async def get_document_chunk_repository(
     session: AsyncSession = Depends(get_db_session),
+    read_session: AsyncSession | None = Depends(get_read_db_session),
 ) -> DocumentChunkRepository:
-    return DocumentChunkRepository(session)
+    return DocumentChunkRepository(session, read_session)
+
 
+async def get_ingestion_job_repository(
+    session: AsyncSession = Depends(get_db_session),
+) -> IngestionJobRepository:
+    return IngestionJobRepository(session)
 
-async def get_storage_repository() -> StorageRepository:
-    return StorageRepository()
+
+async def get_storage_repository(request: Request) -> StorageRepository:
+    return request.app.state.storage_repository
 
 
 async def get_message_repository(
     session: AsyncSession = Depends(get_db_session),
+    read_session: AsyncSession | None = Depends(get_read_db_session),
 ) -> MessageRepository:
-    return MessageRepository(session)
+    return MessageRepository(session, read_session)
+
+
+async def get_chat_session_repository(
+    session: AsyncSession = Depends(get_db_session),
+    read_session: AsyncSession | None = Depends(get_read_db_session),
+) -> ChatSessionRepository:
+    return ChatSessionRepository(session, read_session)
 
 
 # Services
@@ -60,58 +116,104 @@ async def get_auth_service(
     return AuthService(user_repo)
 
 
+async def get_user_status_cache(request: Request) -> UserStatusCache | None:
+    return request.app.state.user_status_cache
+
+
+async def get_login_rate_limiter(request: Request) -> LoginRateLimiter | None:
+    return request.app.state.login_rate_limiter
+
+
 async def get_user_service(
     user_repo: UserRepository = Depends(get_user_repository),
+    status_cache: UserStatusCache | None = Depends(get_user_status_cache),
 ) -> UserService:
-    return UserService(user_repo)
+    return UserService(user_repo, status_cache)
 
 
 async def get_storage_service(
+    request: Request,
     repo: StorageRepository = Depends(get_storage_repository),
 ) -> StorageService:
-    return StorageService(repo)
+    return StorageService(repo, url_cache=request.app.state.presigned_url_cache)
+
+
+async def get_embedding_service(request: Request) -> EmbeddingService:
+    return request.app.state.embedding_service
 
 
-async def get_embedding_service() -> EmbeddingService:
-    return EmbeddingService()
+async def get_retrieval_cache(request: Request) -> RetrievalCache | None:
+    return request.app.state.retrieval_cache
 
 
 async def get_document_service(
     doc_repo: DocumentRepository = Depends(get_document_repository),
     chunk_repo: DocumentChunkRepository = Depends(get_document_chunk_repository),
+    job_repo: IngestionJobRepository = Depends(get_ingestion_job_repository),
     storage_service: StorageService = Depends(get_storage_service),
     embedding_service: EmbeddingService = Depends(get_embedding_service),
+    retrieval_cache: RetrievalCache | None = Depends(get_retrieval_cache),
 ) -> DocumentService:
-    return DocumentService(doc_repo, chunk_repo, storage_service, embedding_service)
+    return DocumentService(
+        doc_repo,
+        chunk_repo,
+        job_repo,
+        storage_service,
+        embedding_service,
+        retrieval_cache,
+    )
 
 
 async def get_boe_document_service(
     doc_repo: DocumentRepository = Depends(get_document_repository),
     chunk_repo: DocumentChunkRepository = Depends(get_document_chunk_repository),
+    job_repo: IngestionJobRepository = Depends(get_ingestion_job_repository),
     storage_service: StorageService = Depends(get_storage_service),
     embedding_service: EmbeddingService = Depends(get_embedding_service),
+    retrieval_cache: RetrievalCache | None = Depends(get_retrieval_cache),
 ) -> BoeDocumentService:
-    return BoeDocumentService(doc_repo, chunk_repo, storage_service, embedding_service)
+    return BoeDocumentService(
+        doc_repo,
+        chunk_repo,
+        job_repo,
+        storage_service,
+        embedding_service,
+        retrieval_cache,
+    )
+
 
+async def get_chat_agent(request: Request) -> ChatAgent:
+    return request.app.state.chat_agent
 
-async def get_chat_agent() -> ChatAgent:
-    return ChatAgent()
+
+async def get_chat_summarizer(request: Request) -> ChatSummarizer | None:
+    return request.app.state.chat_summarizer
 
 
 async def get_chat_service(
     message_repo: MessageRepository = Depends(get_message_repository),
-    chunk_repo: DocumentChunkRepository = Depends(get_document_chunk_repository),
+    chat_session_repo: ChatSessionRepository = Depends(get_chat_session_repository),
     embedding_service: EmbeddingService = Depends(get_embedding_service),
     agent: ChatAgent = Depends(get_chat_agent),
+    retrieval_cache: RetrievalCache | None = Depends(get_retrieval_cache),
+    summarizer: ChatSummarizer | None = Depends(get_chat_summarizer),
 ) -> ChatService:
-    return ChatService(message_repo, chunk_repo, embedding_service, agent)
+    return ChatService(
+        message_repo,
+        chat_session_repo,
+        embedding_service,
+        agent,
+        retrieval_cache,
+        summarizer,
+    )
 
 
 # Current User
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     user_repo: UserRepository = Depends(get_user_repository),
-) -> User:
+    status_cache: UserStatusCache | None = Depends(get_user_status_cache),
+) -> CurrentUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -121,22 +223,31 @@ async def get_current_user(
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        email: str = payload.get("sub", "")
-        if email == "":
-            raise credentials_exception
-        token_data = TokenData(email=email)
-    except JWTError:
+        user_id = int(payload["uid"])
+        email = payload["sub"]
+        role = UserRole(payload["role"])
+    except (JWTError, KeyError, TypeError, ValueError):
         raise credentials_exception
 
-    user = await user_repo.get_by_email(email=token_data.email or email)
-    if user is None:
+    # The active flag and role are read from the users table, cached for up to
+    # AUTH_USER_CACHE_TTL_SECONDS; a token issued for another role is rejected
+    cached = status_cache.get(user_id) if status_cache is not None else None
+    if cached is None:
+        cached = await user_repo.get_status(user_id)
+        if cached is None:
+            raise credentials_exception
+        if status_cache is not None:
+            status_cache.set(user_id, *cached)
+    is_active, current_role = cached
+    if current_role != role:
         raise credentials_exception
-    if not user.is_active:
+    if not is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    return user
+
+    return CurrentUser(id=user_id, email=email, role=role, is_active=is_active)
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: CurrentUser = Depends(get_current_user),
+) -> CurrentUser:
     return current_user
@@ -1,11 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from src.api.dependencies import get_auth_service, get_current_user
+from src.api.dependencies import (
+    get_auth_service,
+    get_client_ip,
+    get_current_user,
+    get_login_rate_limiter,
+)
 from src.core.security import create_access_token
-from src.domain.models.user import User
 from src.domain.schemas.token import Token
-from src.domain.schemas.user import UserCreate, UserResponse
+from src.domain.schemas.user import CurrentUser, UserCreate, UserResponse
 from src.services.auth_service import AuthService
+from src.services.login_rate_limiter import LoginRateLimiter
 
 router = APIRouter()
 
@@ -25,21 +30,39 @@ async def register(
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     auth_service: AuthService = Depends(get_auth_service),
+    rate_limiter: LoginRateLimiter | None = Depends(get_login_rate_limiter),
+    ip: str | None = Depends(get_client_ip),
 ):
+    if rate_limiter:
+        retry_after = rate_limiter.retry_after(form_data.username, ip)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many failed login attempts",
+                headers={"Retry-After": str(retry_after)},
+            )
+
     user = await auth_service.authenticate_user(form_data.username, form_data.password)
+    if rate_limiter:
+        if user:
+            rate_limiter.reset(form_data.username)
+        else:
+            rate_limiter.record_failure(form_data.username, ip)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = create_access_token(subject=user.email)
+    access_token = create_access_token(
+        subject=user.email, claims={"uid": user.id, "role": user.role.value}
+    )
     return {"access_token": access_token, "token_type": "bearer"}
 
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ) -> UserResponse:
     """
     Obtiene la información del usuario autenticado actualmente.
@@ -1,13 +1,19 @@
+import json
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends
+import logfire
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from src.api.dependencies import (
     get_chat_service,
+    get_chat_session_repository,
     get_current_active_user,
     get_message_repository,
 )
-from src.domain.models.user import User
+from src.core.pagination import decode_cursor, decode_datetime, encode_cursor
+from src.domain.schemas.user import CurrentUser
+from src.repositories.chat_session_repository import ChatSessionRepository
 from src.repositories.message_repository import MessageRepository
 from src.services.chat_service import ChatService
 
@@ -26,9 +32,11 @@ class ChatResponse(BaseModel):
 
 class SessionResponse(BaseModel):
     session_id: str
+    title: str | None = None
     last_message: str
     timestamp: str
     role: str
+    message_count: int = 0
 
 
 class MessageResponse(BaseModel):
@@ -41,7 +49,7 @@ class MessageResponse(BaseModel):
 @router.post("/message", response_model=ChatResponse)
 async def chat_message(
     request: ChatRequest,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     service: ChatService = Depends(get_chat_service),
 ):
     # Generate session_id if not provided
@@ -53,20 +61,89 @@ async def chat_message(
     return ChatResponse(response=response, session_id=session_id)
 
 
+@router.post("/message/stream")
+async def chat_message_stream(
+    request: ChatRequest,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    service: ChatService = Depends(get_chat_service),
+):
+    """
+    Stream the answer as Server-Sent Events.
+
+    Events: `session` (session_id), `token` (text delta), `tool_call`,
+    `tool_result`, `done` (full response) and `error`.
+    """
+    session_id = request.session_id or str(uuid4())
+
+    def sse(event: str, data: dict) -> str:
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    async def event_stream():
+        yield sse("session", {"session_id": session_id})
+        try:
+            async for event, data in service.stream_chat_response(
+                current_user, request.message, session_id
+            ):
+                yield sse(event, data)
+        except Exception:
+            logfire.exception("Chat stream failed")
+            yield sse("error", {"detail": "Error generating response"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # Keep proxies (nginx) from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/sessions", response_model=list[SessionResponse])
 async def get_sessions(
-    current_user: User = Depends(get_current_active_user),
-    message_repo: MessageRepository = Depends(get_message_repository),
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=100),
+    cursor: str | None = None,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    session_repo: ChatSessionRepository = Depends(get_chat_session_repository),
 ):
-    """Get all chat sessions for the current user."""
-    sessions = await message_repo.get_sessions_by_user(current_user.id)
-    return sessions
+    """
+    Chat sessions of the current user, most recent first.
+
+    When there are more, the `X-Next-Cursor` response header holds the
+    `cursor` for the next page.
+    """
+    after = None
+    if cursor:
+        try:
+            last_activity, session_pk = decode_cursor(cursor)
+            after = (decode_datetime(last_activity), int(session_pk))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    sessions = await session_repo.list_by_user(current_user.id, limit + 1, after)
+    if len(sessions) > limit:
+        sessions = sessions[:limit]
+        last = sessions[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            last.last_activity.isoformat(), last.id
+        )
+
+    return [
+        SessionResponse(
+            session_id=chat_session.session_id,
+            title=chat_session.title,
+            last_message=chat_session.last_message or "",
+            timestamp=chat_session.last_activity.isoformat(),
+            role=chat_session.last_role.value if chat_session.last_role else "",
+            message_count=chat_session.message_count,
+        )
+        for chat_session in sessions
+    ]
 
 
 @router.get("/sessions/{session_id}/messages", response_model=list[MessageResponse])
 async def get_session_messages(
     session_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     message_repo: MessageRepository = Depends(get_message_repository),
 ):
     """Get all messages for a specific session."""
@@ -85,7 +162,7 @@ async def get_session_messages(
 @router.delete("/sessions/{session_id}")
 async def delete_session(
     session_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     message_repo: MessageRepository = Depends(get_message_repository),
 ):
     """Delete a specific chat session."""
@@ -1,14 +1,30 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+)
 
 from src.api.dependencies import (
     get_boe_document_service,
     get_current_active_user,
     get_document_service,
 )
-from src.domain.models.user import User
-from src.domain.schemas.document import DocumentResponse
+from src.core.pagination import decode_cursor, decode_datetime, encode_cursor
+from src.domain.models.ingestion_job import IngestionJobStatus
+from src.domain.schemas.document import (
+    DocumentBatchRequest,
+    DocumentDetailResponse,
+    DocumentListFilters,
+    DocumentResponse,
+    DocumentStatusResponse,
+)
+from src.domain.schemas.user import CurrentUser
 from src.services.boe_document_service import BoeDocumentService
 from src.services.document_service import DocumentService
 
@@ -19,7 +35,7 @@ router = APIRouter()
 async def upload_document(
     file: UploadFile = File(...),
     is_boe: bool = False,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     service: DocumentService = Depends(get_document_service),
     boe_service: BoeDocumentService = Depends(get_boe_document_service),
 ):
@@ -30,29 +46,96 @@ async def upload_document(
 
 @router.get("/", response_model=List[DocumentResponse])
 async def list_documents(
-    current_user: User = Depends(get_current_active_user),
+    response: Response,
+    filters: DocumentListFilters = Depends(),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    service: DocumentService = Depends(get_document_service),
+):
+    """
+    Documents visible to the current user, newest first.
+
+    When there are more, the `X-Next-Cursor` response header holds the
+    `cursor` for the next page.
+    """
+    after = None
+    if cursor:
+        try:
+            created_at, doc_id = decode_cursor(cursor)
+            after = (decode_datetime(created_at), int(doc_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    docs = await service.get_documents(current_user, filters, limit + 1, after)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            last.created_at.isoformat(), last.id
+        )
+    return docs
+
+
+@router.post("/batch", response_model=List[DocumentDetailResponse])
+async def get_documents_batch(
+    request: DocumentBatchRequest,
+    current_user: CurrentUser = Depends(get_current_active_user),
     service: DocumentService = Depends(get_document_service),
 ):
-    return await service.get_documents(current_user)
+    """Metadata and download URLs for several documents in one call.
 
+    Unknown or inaccessible ids are left out of the response.
+    """
+    results = await service.get_documents_by_ids(current_user, request.ids)
+    return [
+        DocumentDetailResponse(
+            metadata=DocumentResponse.model_validate(doc), download_url=url
+        )
+        for doc, url in results
+    ]
 
-@router.get("/{doc_id}")
+
+@router.get("/{doc_id}", response_model=DocumentDetailResponse)
 async def get_document(
     doc_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     service: DocumentService = Depends(get_document_service),
 ):
     doc, url = await service.get_document(current_user, doc_id)
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    return {"metadata": DocumentResponse.model_validate(doc), "download_url": url}
+    return DocumentDetailResponse(
+        metadata=DocumentResponse.model_validate(doc), download_url=url
+    )
+
+
+@router.get("/{doc_id}/status", response_model=DocumentStatusResponse)
+async def get_document_status(
+    doc_id: int,
+    current_user: CurrentUser = Depends(get_current_active_user),
+    service: DocumentService = Depends(get_document_service),
+):
+    doc, job = await service.get_document_status(current_user, doc_id)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    return DocumentStatusResponse(
+        id=doc.id,
+        status=doc.status,
+        error=doc.error,
+        attempts=job.attempts if job else 0,
+        next_attempt_at=(
+            job.run_after if job and job.status == IngestionJobStatus.QUEUED else None
+        ),
+    )
 
 
 @router.delete("/{doc_id}")
 async def delete_document(
     doc_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     service: DocumentService = Depends(get_document_service),
 ):
     try:
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from src.api.dependencies import get_current_active_user
+from src.core.metrics import collect_metrics
+from src.domain.models.user import UserRole
+from src.domain.schemas.user import CurrentUser
+
+router = APIRouter()
+
+
+@router.get("/")
+async def get_metrics(current_user: CurrentUser = Depends(get_current_active_user)):
+    """Cache and pool counters for monitoring. Admin only."""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    return collect_metrics()
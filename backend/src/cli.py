@@ -0,0 +1,183 @@
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+import fitz
+import typer
+from sqlalchemy import func, or_, select, text
+
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal, engine
+from src.core.vector_index import HNSW_INDEXES, create_index_sql
+from src.domain.models.document_chunk import DocumentChunk
+from src.repositories.document_chunk_repository import DocumentChunkRepository
+from src.services.text_splitter import (
+    CharacterTextSplitter,
+    StructuredTextSplitter,
+    estimate_tokens,
+)
+
+app = typer.Typer(help="Maintenance commands for the document index.")
+
+
+@app.command()
+def rebuild_index(
+    m: int = typer.Option(settings.HNSW_M, help="HNSW graph degree."),
+    ef_construction: int = typer.Option(
+        settings.HNSW_EF_CONSTRUCTION, help="Candidate list size while building."
+    ),
+    maintenance_work_mem: str = typer.Option(
+        "1GB", help="Memory for the build; the graph should fit in it."
+    ),
+):
+    """
+    Rebuild the HNSW indexes without blocking writes.
+
+    Each index is built under a temporary name with CREATE INDEX CONCURRENTLY
+    and swapped in for the old one, using the configured VECTOR_INDEX_MODE and
+    VECTOR_INDEX_DIMENSIONS.
+    """
+    asyncio.run(_rebuild_index(m, ef_construction, maintenance_work_mem))
+
+
+async def _rebuild_index(m: int, ef_construction: int, maintenance_work_mem: str):
+    # CONCURRENTLY cannot run inside a transaction block
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(
+            select(func.set_config("maintenance_work_mem", maintenance_work_mem, False))
+        )
+        for name, where in HNSW_INDEXES.items():
+            building = f"{name}_rebuild"
+            # Leftover (invalid) index from an interrupted run
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {building}"))
+
+            typer.echo(f"Building {name} (m={m}, ef_construction={ef_construction})")
+            started = time.perf_counter()
+            await conn.execute(
+                text(
+                    create_index_sql(
+                        building,
+                        settings.VECTOR_INDEX_MODE,
+                        settings.VECTOR_INDEX_DIMENSIONS,
+                        m=m,
+                        ef_construction=ef_construction,
+                        where=where,
+                        concurrently=True,
+                    )
+                )
+            )
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+            await conn.execute(text(f"ALTER INDEX {building} RENAME TO {name}"))
+            typer.echo(f"Built {name} in {time.perf_counter() - started:.1f}s")
+    await engine.dispose()
+
+
+@app.command()
+def recall(
+    k: int = typer.Option(5, help="Results per query."),
+    queries: int = typer.Option(100, help="Number of sampled queries."),
+    ef_search: int = typer.Option(
+        settings.HNSW_EF_SEARCH, help="hnsw.ef_search to evaluate."
+    ),
+):
+    """
+    Measure recall@k of the index-backed search against exact search.
+
+    Queries are embeddings of randomly sampled chunks, searched as their owner
+    with BOE documents included, the same way `retrieve_documents` does.
+    """
+    settings.HNSW_EF_SEARCH = ef_search
+    asyncio.run(_recall(k, queries))
+
+
+async def _recall(k: int, queries: int):
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(DocumentChunk.user_id, DocumentChunk.embedding)
+            .order_by(func.random())
+            .limit(queries)
+        )
+        samples = result.all()
+    if not samples:
+        typer.echo("No chunks to sample")
+        raise typer.Exit(1)
+
+    recalls = []
+    latencies = []
+    for user_id, embedding in samples:
+        embedding = embedding.tolist()
+        async with AsyncSessionLocal() as session:
+            started = time.perf_counter()
+            chunks = await DocumentChunkRepository(session).search_similar(
+                embedding, user_id, include_boe=True, limit=k
+            )
+            latencies.append(time.perf_counter() - started)
+        async with AsyncSessionLocal() as session:
+            expected = await _exact_nearest(session, embedding, user_id, k)
+
+        if expected:
+            found = {chunk.id for chunk in chunks}
+            recalls.append(len(found & expected) / len(expected))
+
+    latencies.sort()
+    typer.echo(
+        f"mode={settings.VECTOR_INDEX_MODE} "
+        f"dimensions={settings.VECTOR_INDEX_DIMENSIONS} ef_search={settings.HNSW_EF_SEARCH}"
+    )
+    typer.echo(f"recall@{k}: {statistics.mean(recalls):.4f} over {len(recalls)}")
+    typer.echo(
+        f"latency p50: {statistics.median(latencies) * 1000:.1f} ms, "
+        f"p95: {latencies[int(len(latencies) * 0.95)] * 1000:.1f} ms"
+    )
+    await engine.dispose()
+
+
+async def _exact_nearest(session, embedding: list[float], user_id: int, k: int):
+    # Exact search: keep the planner off the (approximate) HNSW indexes
+    await session.execute(select(func.set_config("enable_indexscan", "off", True)))
+    distance = DocumentChunk.embedding.cosine_distance(embedding)
+    result = await session.execute(
+        select(DocumentChunk.id)
+        .where(or_(DocumentChunk.user_id == user_id, DocumentChunk.is_boe))
+        .order_by(distance)
+        .limit(k)
+    )
+    return set(result.scalars().all())
+
+
+@app.command()
+def compare_splitters(path: Path):
+    """
+    Chunk count and embedded tokens of each text splitter on a PDF or text
+    file. Embedding cost is proportional to the tokens sent.
+    """
+    if path.suffix.lower() == ".pdf":
+        with fitz.open(path) as doc:
+            pages = [(i + 1, page.get_text()) for i, page in enumerate(doc)]
+    else:
+        pages = [(None, path.read_text())]
+
+    source_tokens = sum(estimate_tokens(text) for _, text in pages)
+    typer.echo(f"{path.name}: {len(pages)} pages, ~{source_tokens} tokens")
+    splitters = {
+        "character": CharacterTextSplitter(),
+        "structured": StructuredTextSplitter(
+            max_tokens=settings.CHUNK_MAX_TOKENS,
+            overlap_tokens=settings.CHUNK_OVERLAP_TOKENS,
+        ),
+    }
+    for name, splitter in splitters.items():
+        chunks = [chunk for page in pages for _, chunk in splitter.feed(*page)]
+        chunks += [chunk for _, chunk in splitter.finish()]
+        tokens = [estimate_tokens(chunk) for chunk in chunks]
+        typer.echo(
+            f"{name:>10}: {len(chunks)} chunks, ~{sum(tokens)} tokens embedded "
+            f"({sum(tokens) / max(source_tokens, 1):.2f}x source), "
+            f"max {max(tokens, default=0)} per chunk"
+        )
+
+
+if __name__ == "__main__":
+    app()
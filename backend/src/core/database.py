@@ -1,13 +1,38 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import functools
+import time
+
+import logfire
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
 from src.core.config import settings
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=False,
-    pool_pre_ping=True,
-)
+
+def _create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=False,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            # SQLAlchemy's prepared statement cache, and asyncpg's own
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+
+
+engine = _create_engine(settings.DATABASE_URL)
 
 # Async Session Factory
 AsyncSessionLocal = async_sessionmaker(
@@ -16,6 +41,17 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Read replica, if configured
+read_engine: AsyncEngine | None = None
+ReadSessionLocal: async_sessionmaker[AsyncSession] | None = None
+if settings.READ_DATABASE_URL:
+    read_engine = _create_engine(settings.READ_DATABASE_URL)
+    ReadSessionLocal = async_sessionmaker(
+        bind=read_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
 
 class Base(DeclarativeBase):
     pass
@@ -25,3 +61,71 @@ class Base(DeclarativeBase):
 async def get_db_session():
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_db_session():
+    """Session on the read replica, or None when there is none."""
+    if ReadSessionLocal is None:
+        yield None
+        return
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+_replica_down_until = 0.0
+
+
+def _is_connection_error(error: Exception) -> bool:
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated or isinstance(
+            error, (OperationalError, InterfaceError)
+        )
+    # Connection refused or timed out, or no connection left in the pool
+    return isinstance(error, (OSError, PoolTimeoutError))
+
+
+def read_only(method):
+    """
+    Run a repository read on its `read_session` (the replica) if it has one,
+    otherwise on its `session`. The wrapped method gets the session to use as
+    its first argument.
+
+    When the replica cannot be reached, the read is retried on the primary
+    and the replica is skipped for READ_DATABASE_RETRY_SECONDS.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        global _replica_down_until
+        read_session = self.read_session
+        if read_session is None or time.monotonic() < _replica_down_until:
+            return await method(self, self.session, *args, **kwargs)
+        try:
+            return await method(self, read_session, *args, **kwargs)
+        except Exception as e:
+            if not _is_connection_error(e):
+                raise
+            logfire.warn(
+                "Read replica unavailable, using the primary: {error}", error=str(e)
+            )
+            _replica_down_until = (
+                time.monotonic() + settings.READ_DATABASE_RETRY_SECONDS
+            )
+            await read_session.rollback()
+            return await method(self, self.session, *args, **kwargs)
+
+    return wrapper
+
+
+def pool_stats() -> dict:
+    engines = {"primary": engine, "replica": read_engine}
+    return {
+        name: {
+            "size": e.pool.size(),
+            "checked_out": e.pool.checkedout(),
+            "checked_in": e.pool.checkedin(),
+            "overflow": e.pool.overflow(),
+        }
+        for name, e in engines.items()
+        if e is not None
+    }
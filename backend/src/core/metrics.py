@@ -0,0 +1,14 @@
+from typing import Callable
+
+MetricsProvider = Callable[[], dict]
+
+_providers: dict[str, MetricsProvider] = {}
+
+
+def register_metrics(name: str, provider: MetricsProvider) -> None:
+    """Expose `provider()` under `name` in GET /api/metrics."""
+    _providers[name] = provider
+
+
+def collect_metrics() -> dict[str, dict]:
+    return {name: provider() for name, provider in _providers.items()}
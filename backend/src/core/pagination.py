@@ -0,0 +1,32 @@
+import base64
+import json
+from datetime import datetime, timezone
+
+
+def encode_cursor(*values) -> str:
+    """Opaque keyset cursor for the sort key of the last row returned."""
+    payload = json.dumps(values, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    """Values passed to `encode_cursor`. Raises ValueError if malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """`value` as a naive UTC datetime, like the timestamp columns it is compared to."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def decode_datetime(value: str) -> datetime:
+    """An ISO timestamp from a cursor, as naive UTC. Raises ValueError if malformed."""
+    return to_naive_utc(datetime.fromisoformat(value))
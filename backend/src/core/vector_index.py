@@ -0,0 +1,115 @@
+from typing import Literal
+
+from pgvector.sqlalchemy import BIT, HALFVEC, VECTOR
+from sqlalchemy import cast, func, literal_column, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# Dimensions stored in document_chunks.embedding
+EMBEDDING_DIMENSIONS = 2000
+
+VectorIndexMode = Literal["vector", "halfvec", "binary"]
+
+# HNSW indexes on document_chunks and their partial-index predicate
+HNSW_INDEXES: dict[str, str | None] = {
+    "document_chunks_embedding_idx": None,
+    "document_chunks_boe_embedding_idx": "is_boe",
+}
+
+
+def index_target_sql(mode: VectorIndexMode, dimensions: int) -> tuple[str, str]:
+    """
+    Expression the HNSW index is built on, and its operator class.
+
+    Truncated (Matryoshka) and quantized modes index an expression over the
+    full-precision column, which is kept for re-ranking. `indexed_distance`
+    must build the exact same expression for the planner to use the index.
+    """
+    if mode == "vector" and dimensions == EMBEDDING_DIMENSIONS:
+        return "embedding", "vector_cosine_ops"
+
+    prefix = f"subvector(embedding, 1, {dimensions})"
+    if mode == "vector":
+        return f"({prefix}::vector({dimensions}))", "vector_cosine_ops"
+    if mode == "halfvec":
+        return f"({prefix}::halfvec({dimensions}))", "halfvec_cosine_ops"
+    if mode == "binary":
+        return f"(binary_quantize({prefix})::bit({dimensions}))", "bit_hamming_ops"
+    raise ValueError(f"Unknown vector index mode: {mode}")
+
+
+def _indexdef_markers(mode: VectorIndexMode, dimensions: int) -> list[str]:
+    """Fragments of `pg_get_indexdef` output for an index built on the target."""
+    if mode == "vector" and dimensions == EMBEDDING_DIMENSIONS:
+        return ["USING hnsw (embedding vector_cosine_ops)"]
+    prefix = f"subvector(embedding, 1, {dimensions})"
+    if mode == "binary":
+        return [f"binary_quantize({prefix})", f"::bit({dimensions})", "bit_hamming_ops"]
+    return [prefix, f"::{mode}({dimensions})", f"{mode}_cosine_ops"]
+
+
+async def mismatched_indexes(
+    conn: AsyncConnection, mode: VectorIndexMode, dimensions: int
+) -> list[str]:
+    """
+    HNSW indexes that are missing or not built on the expression queried for
+    `mode` and `dimensions`: searches would fall back to sequential scans.
+    """
+    result = await conn.execute(
+        text(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE tablename = 'document_chunks' AND indexname = ANY(:names)"
+        ),
+        {"names": list(HNSW_INDEXES)},
+    )
+    definitions = dict(result.all())
+    markers = _indexdef_markers(mode, dimensions)
+    return [
+        name
+        for name in HNSW_INDEXES
+        if not all(marker in definitions.get(name, "") for marker in markers)
+    ]
+
+
+def create_index_sql(
+    name: str,
+    mode: VectorIndexMode,
+    dimensions: int,
+    m: int,
+    ef_construction: int,
+    where: str | None = None,
+    concurrently: bool = False,
+) -> str:
+    target, opclass = index_target_sql(mode, dimensions)
+    sql = (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}{name} "
+        f"ON document_chunks USING hnsw ({target} {opclass}) "
+        f"WITH (m = {m}, ef_construction = {ef_construction})"
+    )
+    if where:
+        sql += f" WHERE {where}"
+    return sql
+
+
+def indexed_distance(
+    column, embedding: list[float], mode: VectorIndexMode, dimensions: int
+):
+    """Distance between `embedding` and `column` as seen by the HNSW index."""
+    if mode == "vector" and dimensions == EMBEDDING_DIMENSIONS:
+        return column.cosine_distance(embedding)
+
+    # Literal bounds: the expression has to match the index definition
+    prefix = func.subvector(
+        column, literal_column("1"), literal_column(str(dimensions))
+    )
+    query = embedding[:dimensions]
+    if mode == "vector":
+        return cast(prefix, VECTOR(dimensions)).cosine_distance(query)
+    if mode == "halfvec":
+        return cast(prefix, HALFVEC(dimensions)).cosine_distance(query)
+    if mode == "binary":
+        # Same quantization as pgvector's binary_quantize: 1 for x > 0
+        bits = "".join("1" if x > 0 else "0" for x in query)
+        return cast(func.binary_quantize(prefix), BIT(dimensions)).hamming_distance(
+            bits
+        )
+    raise ValueError(f"Unknown vector index mode: {mode}")
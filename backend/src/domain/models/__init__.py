@@ -1,6 +1,19 @@
-from .document import Document
+from .chat_session import ChatSession
+from .document import Document, DocumentStatus
 from .document_chunk import DocumentChunk
+from .embedding_cache import EmbeddingCacheEntry
+from .ingestion_job import IngestionJob, IngestionJobStatus
 from .message import Message
 from .user import User
 
-__all__ = ["User", "Document", "DocumentChunk", "Message"]
+__all__ = [
+    "User",
+    "ChatSession",
+    "Document",
+    "DocumentStatus",
+    "DocumentChunk",
+    "EmbeddingCacheEntry",
+    "IngestionJob",
+    "IngestionJobStatus",
+    "Message",
+]
@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import Base
+from src.domain.models.message import MessageRole
+
+
+class ChatSession(Base):
+    __tablename__ = "chat_sessions"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "session_id", name="uq_chat_sessions_user_id_session_id"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+    session_id: Mapped[str] = mapped_column(String)
+    # Maintained with every turn for the session list
+    title: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    last_message: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    last_role: Mapped[Optional[MessageRole]] = mapped_column(
+        Enum(MessageRole, native_enum=False), nullable=True
+    )
+    last_activity: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    message_count: Mapped[int] = mapped_column(default=0)
+    # Rolling summary of every message up to (and including) summarized_until
+    summary: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    summarized_until: Mapped[Optional[int]] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+# Keyset pagination of a user's sessions, most recent first
+Index(
+    "ix_chat_sessions_user_id_last_activity",
+    ChatSession.user_id,
+    ChatSession.last_activity.desc(),
+    ChatSession.id.desc(),
+)
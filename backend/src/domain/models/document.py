@@ -1,7 +1,8 @@
+import enum
 from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import Enum, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.database import Base
@@ -11,18 +12,51 @@ if TYPE_CHECKING:
     from src.domain.models.user import User
 
 
+class DocumentStatus(str, enum.Enum):
+    PENDING = "pending"
+    PARSING = "parsing"
+    EMBEDDING = "embedding"
+    READY = "ready"
+    FAILED = "failed"
+
+
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        Index(
+            "ix_documents_user_id_content_hash", "user_id", "content_hash", unique=True
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
     filename: Mapped[str] = mapped_column(String)
-    file_key: Mapped[str] = mapped_column(String, unique=True)
+    # Identical uploads share one S3 object, so the key is not unique
+    file_key: Mapped[str] = mapped_column(String, index=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, index=True
+    )
     size: Mapped[int] = mapped_column()
     content_type: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # BOE bulletins are visible to BOE and ADMIN users, not only their owner
+    is_boe: Mapped[bool] = mapped_column(default=False)
+    status: Mapped[DocumentStatus] = mapped_column(
+        Enum(DocumentStatus, native_enum=False), default=DocumentStatus.PENDING
+    )
+    error: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
 
     user: Mapped["User"] = relationship(back_populates="documents")
     chunks: Mapped[List["DocumentChunk"]] = relationship(
         back_populates="document", cascade="all, delete-orphan"
     )
+
+
+# Listing order (newest first), for all documents and per owner
+Index("ix_documents_created_at_id", Document.created_at.desc(), Document.id.desc())
+Index(
+    "ix_documents_user_id_created_at_id",
+    Document.user_id,
+    Document.created_at.desc(),
+    Document.id.desc(),
+)
@@ -1,20 +1,41 @@
+from typing import Optional
+
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import Computed, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.database import Base
 
+TEXT_SEARCH_CONFIG = "spanish"
+
 
 class DocumentChunk(Base):
     __tablename__ = "document_chunks"
+    __table_args__ = (
+        Index("ix_document_chunks_content_tsv", "content_tsv", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     document_id: Mapped[int] = mapped_column(
         ForeignKey("documents.id", ondelete="CASCADE"),
         index=True,
     )
+    # Denormalized from the document so retrieval can filter by access
+    # without joining documents
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+    is_boe: Mapped[bool] = mapped_column(default=False)
     chunk_index: Mapped[int] = mapped_column()
+    page_number: Mapped[Optional[int]] = mapped_column(nullable=True)
     content: Mapped[str] = mapped_column(String)
     embedding: Mapped[Vector] = mapped_column(Vector(2000))
+    # Lexical index for hybrid retrieval, maintained by Postgres
+    content_tsv: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{TEXT_SEARCH_CONFIG}', content)", persisted=True),
+        deferred=True,
+    )
 
     document = relationship("Document", back_populates="chunks")
@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import Base
+
+
+class EmbeddingCacheEntry(Base):
+    __tablename__ = "embedding_cache"
+
+    # sha256(model, task_type, dimensions, text), see EmbeddingCache.make_key
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    embedding: Mapped[Vector] = mapped_column(Vector())
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
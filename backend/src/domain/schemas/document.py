@@ -1,6 +1,10 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
+
+from src.core.config import settings
+from src.core.pagination import to_naive_utc
+from src.domain.models.document import DocumentStatus
 
 
 class DocumentCreate(BaseModel):
@@ -13,8 +17,43 @@ class DocumentResponse(BaseModel):
     filename: str
     size: int
     content_type: str | None
+    status: DocumentStatus
     created_at: datetime
     # We might generate a presigned url as well, but that's dynamic
 
     class Config:
         from_attributes = True
+
+
+class DocumentListFilters(BaseModel):
+    """Query parameters narrowing GET /documents/."""
+
+    filename_prefix: str | None = None
+    content_type: str | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    # Only useful to ADMIN and BOE users: others only see their own documents
+    owner_id: int | None = None
+
+    @field_validator("created_after", "created_before")
+    @classmethod
+    def _naive_utc(cls, value: datetime | None) -> datetime | None:
+        # created_at is stored as naive UTC
+        return to_naive_utc(value) if value is not None else None
+
+
+class DocumentStatusResponse(BaseModel):
+    id: int
+    status: DocumentStatus
+    error: str | None
+    attempts: int
+    next_attempt_at: datetime | None
+
+
+class DocumentDetailResponse(BaseModel):
+    metadata: DocumentResponse
+    download_url: str
+
+
+class DocumentBatchRequest(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=settings.DOCUMENT_BATCH_MAX_IDS)
@@ -14,6 +14,19 @@ class UserLogin(UserBase):
     password: str
 
 
+class CurrentUser(BaseModel):
+    """The authenticated user, as resolved from an access token."""
+
+    id: int
+    email: str
+    role: UserRole
+    is_active: bool
+
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
 class UserResponse(UserBase):
     id: int
     role: UserRole
@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import read_only
+from src.domain.models.chat_session import ChatSession
+
+
+class ChatSessionRepository:
+    def __init__(self, session: AsyncSession, read_session: AsyncSession | None = None):
+        self.session = session
+        self.read_session = read_session
+
+    async def get(self, user_id: int, session_id: str) -> ChatSession | None:
+        stmt = select(ChatSession).where(
+            ChatSession.user_id == user_id, ChatSession.session_id == session_id
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @read_only
+    async def list_by_user(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[ChatSession]:
+        """Sessions by most recent activity, after the `(last_activity, id)` key."""
+        stmt = (
+            select(ChatSession)
+            .where(ChatSession.user_id == user_id)
+            .order_by(ChatSession.last_activity.desc(), ChatSession.id.desc())
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(ChatSession.last_activity, ChatSession.id) < tuple_(*after)
+            )
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def save_summary(
+        self, user_id: int, session_id: str, summary: str, summarized_until: int
+    ) -> None:
+        now = datetime.utcnow()
+        stmt = insert(ChatSession).values(
+            user_id=user_id,
+            session_id=session_id,
+            summary=summary,
+            summarized_until=summarized_until,
+            created_at=now,
+            updated_at=now,
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_chat_sessions_user_id_session_id",
+            set_={
+                "summary": stmt.excluded.summary,
+                "summarized_until": stmt.excluded.summarized_until,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
@@ -1,19 +1,80 @@
-from sqlalchemy import select
+import struct
+from typing import AsyncIterator
+
+from pgvector import Vector
+from sqlalchemy import delete, func, insert, literal, or_, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domain.models.document_chunk import DocumentChunk
+from src.core.config import settings
+from src.core.database import read_only
+from src.core.vector_index import EMBEDDING_DIMENSIONS, indexed_distance
+from src.domain.models.document import Document
+from src.domain.models.document_chunk import TEXT_SEARCH_CONFIG, DocumentChunk
+
+_COPY_COLUMNS = [
+    "document_id",
+    "user_id",
+    "is_boe",
+    "chunk_index",
+    "page_number",
+    "content",
+    "embedding",
+]
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def _copy_field(value: bytes | None) -> bytes:
+    if value is None:
+        return struct.pack("!i", -1)
+    return struct.pack("!i", len(value)) + value
+
+
+async def _copy_stream(chunks: list[DocumentChunk]) -> AsyncIterator[bytes]:
+    """Encode chunks in Postgres' binary COPY format, about 1 MiB at a time."""
+    buffer = bytearray(_COPY_HEADER)
+    for chunk in chunks:
+        buffer += struct.pack("!h", len(_COPY_COLUMNS))
+        buffer += _copy_field(struct.pack("!i", chunk.document_id))
+        buffer += _copy_field(struct.pack("!i", chunk.user_id))
+        buffer += _copy_field(b"\x01" if chunk.is_boe else b"\x00")
+        buffer += _copy_field(struct.pack("!i", chunk.chunk_index))
+        buffer += _copy_field(
+            None if chunk.page_number is None else struct.pack("!i", chunk.page_number)
+        )
+        buffer += _copy_field(chunk.content.encode())
+        # Same layout as pgvector's vector_send
+        buffer += _copy_field(Vector(chunk.embedding).to_binary())
+        if len(buffer) >= _COPY_BUFFER_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += struct.pack("!h", -1)
+    yield bytes(buffer)
 
 
 class DocumentChunkRepository:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_session: AsyncSession | None = None):
         self.session = session
+        self.read_session = read_session
+
+    async def create_many(self, chunks: list[DocumentChunk]) -> None:
+        """
+        Bulk-load chunks with a binary COPY in the session's transaction.
 
-    async def create_many(self, chunks: list[DocumentChunk]) -> list[DocumentChunk]:
-        self.session.add_all(chunks)
+        The chunks are not added to the session and ids are not fetched back.
+        """
+        connection = await self.session.connection()
+        # The asyncpg adapter only sends BEGIN before its first statement; a
+        # COPY on the driver connection would otherwise autocommit on its own
+        await connection.execute(select(literal(1)))
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_to_table(
+            DocumentChunk.__tablename__,
+            source=_copy_stream(chunks),
+            columns=_COPY_COLUMNS,
+            format="binary",
+        )
         await self.session.commit()
-        for chunk in chunks:
-            await self.session.refresh(chunk)
-        return chunks
 
     async def get_by_document_id(self, document_id: int) -> list[DocumentChunk]:
         stmt = (
@@ -24,14 +85,185 @@ class DocumentChunkRepository:
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    @read_only
+    async def get_many_by_ids(
+        self, session: AsyncSession, chunk_ids: list[int]
+    ) -> list[DocumentChunk]:
+        """Chunks among `chunk_ids` that still exist, in the order given."""
+        stmt = select(DocumentChunk).where(DocumentChunk.id.in_(chunk_ids))
+        result = await session.execute(stmt)
+        chunks = {chunk.id: chunk for chunk in result.scalars().all()}
+        return [chunks[chunk_id] for chunk_id in chunk_ids if chunk_id in chunks]
+
+    async def copy_to_document(self, source_id: int, target: Document) -> None:
+        """Duplicate the chunks of one document onto another, server-side."""
+        columns = ["chunk_index", "page_number", "content", "embedding"]
+        stmt = insert(DocumentChunk).from_select(
+            ["document_id", "user_id", "is_boe", *columns],
+            select(
+                literal(target.id),
+                literal(target.user_id),
+                literal(target.is_boe),
+                *(getattr(DocumentChunk, column) for column in columns),
+            ).where(DocumentChunk.document_id == source_id),
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+    async def delete_by_document_id(self, document_id: int) -> None:
+        stmt = delete(DocumentChunk).where(DocumentChunk.document_id == document_id)
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+    @read_only
     async def search_similar(
-        self, embedding: list[float], limit: int = 5
+        self,
+        session: AsyncSession,
+        embedding: list[float],
+        user_id: int,
+        include_boe: bool = False,
+        limit: int = 5,
     ) -> list[DocumentChunk]:
-        # Using pgvector cosine distance operator <->
+        """
+        Nearest chunks among those `user_id` may read: their own documents and,
+        with `include_boe`, every BOE document.
+        """
+        await self._configure_hnsw_scan(session)
+        candidates = self._nearest(embedding, user_id, include_boe, limit)
+
+        # relaxed_order scans may return rows slightly out of order: re-sort
         stmt = (
             select(DocumentChunk)
-            .order_by(DocumentChunk.embedding.cosine_distance(embedding))
+            .join(candidates, DocumentChunk.id == candidates.c.id)
+            .order_by(candidates.c.distance)
             .limit(limit)
         )
-        result = await self.session.execute(stmt)
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    @read_only
+    async def hybrid_search(
+        self,
+        session: AsyncSession,
+        embedding: list[float],
+        query: str,
+        user_id: int,
+        include_boe: bool = False,
+        limit: int = 5,
+    ) -> list[DocumentChunk]:
+        """
+        Vector and full-text search over the same accessible chunks, fused with
+        reciprocal rank fusion: score = sum(weight / (HYBRID_RRF_K + rank)).
+
+        Both candidate lists are computed by Postgres in a single statement.
+        """
+        await self._configure_hnsw_scan(session)
+        n = settings.HYBRID_CANDIDATES
+        k = settings.HYBRID_RRF_K
+
+        nearest = self._nearest(embedding, user_id, include_boe, n)
+        vector = select(
+            nearest.c.id,
+            func.row_number().over(order_by=nearest.c.distance).label("rank"),
+        ).subquery()
+
+        tsquery = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query)
+        relevance = func.ts_rank_cd(DocumentChunk.content_tsv, tsquery)
+        lexical = (
+            select(
+                DocumentChunk.id,
+                func.row_number().over(order_by=relevance.desc()).label("rank"),
+            )
+            .where(
+                DocumentChunk.content_tsv.bool_op("@@")(tsquery),
+                self._access_filter(user_id, include_boe),
+            )
+            .order_by(relevance.desc())
+            .limit(n)
+            .subquery()
+        )
+
+        score = func.coalesce(
+            settings.HYBRID_VECTOR_WEIGHT / (k + vector.c.rank), 0
+        ) + func.coalesce(settings.HYBRID_LEXICAL_WEIGHT / (k + lexical.c.rank), 0)
+        fused = (
+            select(
+                func.coalesce(vector.c.id, lexical.c.id).label("id"),
+                score.label("score"),
+            )
+            .select_from(vector.join(lexical, vector.c.id == lexical.c.id, full=True))
+            .order_by(score.desc())
+            .limit(limit)
+            .subquery()
+        )
+
+        stmt = (
+            select(DocumentChunk)
+            .join(fused, DocumentChunk.id == fused.c.id)
+            .order_by(fused.c.score.desc())
+        )
+        result = await session.execute(stmt)
         return list(result.scalars().all())
+
+    def _nearest(
+        self, embedding: list[float], user_id: int, include_boe: bool, limit: int
+    ):
+        """Subquery of (id, distance) for the `limit` nearest accessible chunks."""
+        mode = settings.VECTOR_INDEX_MODE
+        dimensions = settings.VECTOR_INDEX_DIMENSIONS
+        exact_index = mode == "vector" and dimensions == EMBEDDING_DIMENSIONS
+
+        # Using pgvector cosine distance operator <=>
+        distance = DocumentChunk.embedding.cosine_distance(embedding)
+        # Approximate distance on the indexed (truncated/quantized) expression
+        index_distance = indexed_distance(
+            DocumentChunk.embedding, embedding, mode, dimensions
+        )
+        candidates = (
+            limit if exact_index else max(limit, settings.VECTOR_RERANK_CANDIDATES)
+        )
+
+        def nearest(*criteria):
+            return (
+                select(DocumentChunk.id, distance.label("distance"))
+                .where(*criteria)
+                .order_by(index_distance)
+                .limit(candidates)
+            )
+
+        if include_boe:
+            # Two arms so the BOE one can be served by the partial HNSW index
+            own = nearest(DocumentChunk.user_id == user_id, ~DocumentChunk.is_boe)
+            boe = nearest(DocumentChunk.is_boe)
+            arms = union_all(select(own.subquery()), select(boe.subquery())).subquery()
+        else:
+            arms = nearest(DocumentChunk.user_id == user_id).subquery()
+
+        # Re-rank the candidates by full-precision distance
+        return (
+            select(arms.c.id, arms.c.distance)
+            .order_by(arms.c.distance)
+            .limit(limit)
+            .subquery()
+        )
+
+    @staticmethod
+    def _access_filter(user_id: int, include_boe: bool):
+        if include_boe:
+            return or_(DocumentChunk.user_id == user_id, DocumentChunk.is_boe)
+        return DocumentChunk.user_id == user_id
+
+    @staticmethod
+    async def _configure_hnsw_scan(session: AsyncSession) -> None:
+        """Apply the HNSW search settings to the current transaction only (SET LOCAL)."""
+        await session.execute(
+            select(
+                func.set_config(
+                    "hnsw.iterative_scan", settings.HNSW_ITERATIVE_SCAN, True
+                ),
+                func.set_config(
+                    "hnsw.max_scan_tuples", str(settings.HNSW_MAX_SCAN_TUPLES), True
+                ),
+                func.set_config("hnsw.ef_search", str(settings.HNSW_EF_SEARCH), True),
+            )
+        )
@@ -1,11 +1,27 @@
-from sqlalchemy import delete, select
+from datetime import datetime
+
+from sqlalchemy import Row, delete, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.domain.models.document import Document
+from src.core.database import read_only
+from src.domain.models.document import Document, DocumentStatus
+
+# Columns of DocumentResponse: listings skip the rest of the row
+_LISTING_COLUMNS = (
+    Document.id,
+    Document.user_id,
+    Document.filename,
+    Document.size,
+    Document.content_type,
+    Document.status,
+    Document.created_at,
+)
 
 
 class DocumentRepository:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_session: AsyncSession | None = None):
         self.session = session
+        self.read_session = read_session
 
     async def create(self, document: Document) -> Document:
         self.session.add(document)
@@ -13,20 +29,154 @@ class DocumentRepository:
         await self.session.refresh(document)
         return document
 
+    async def create_unless_duplicate(self, document: Document) -> Document | None:
+        """
+        Insert `document`, or return None if its user already has a document
+        with the same content hash (e.g. the same file uploaded concurrently).
+        """
+        values = {
+            column.key: getattr(document, column.key)
+            for column in Document.__table__.columns
+            if getattr(document, column.key) is not None
+        }
+        stmt = (
+            insert(Document)
+            .values(**values)
+            .on_conflict_do_nothing(
+                index_elements=[Document.user_id, Document.content_hash]
+            )
+            .returning(Document)
+        )
+        result = await self.session.scalars(stmt)
+        created = result.one_or_none()
+        await self.session.commit()
+        return created
+
     async def get_by_id(self, doc_id: int) -> Document | None:
         stmt = select(Document).where(Document.id == doc_id)
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def list_by_user(self, user_id: int) -> list[Document]:
-        stmt = select(Document).where(Document.user_id == user_id)
+    async def get_many_by_ids(self, doc_ids: list[int]) -> list[Document]:
+        stmt = select(Document).where(Document.id.in_(doc_ids))
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
-    async def list_all(self) -> list[Document]:
-        stmt = select(Document)
+    async def get_by_content_hash(
+        self, content_hash: str, user_id: int | None = None
+    ) -> Document | None:
+        """Find a document with these bytes, preferring one that is already ingested."""
+        stmt = (
+            select(Document)
+            .where(Document.content_hash == content_hash)
+            .order_by((Document.status == DocumentStatus.READY).desc(), Document.id)
+            .limit(1)
+        )
+        if user_id is not None:
+            stmt = stmt.where(Document.user_id == user_id)
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        return result.scalar_one_or_none()
+
+    async def count_by_file_key(self, file_key: str) -> int:
+        stmt = select(func.count()).where(Document.file_key == file_key)
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
+
+    async def list_by_user(
+        self,
+        user_id: int,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+        *,
+        filename_prefix: str | None = None,
+        content_type: str | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> list[Row]:
+        """
+        Listing columns of the documents of `user_id`, newest first, after the
+        `(created_at, id)` key. Read from the primary, so uploads show at once.
+        """
+        stmt = self._listing(
+            limit,
+            after,
+            filename_prefix=filename_prefix,
+            content_type=content_type,
+            created_after=created_after,
+            created_before=created_before,
+            owner_id=user_id,
+        )
+        result = await self.session.execute(stmt)
+        return list(result.all())
+
+    @read_only
+    async def list_all(
+        self,
+        session: AsyncSession,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+        *,
+        filename_prefix: str | None = None,
+        content_type: str | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        owner_id: int | None = None,
+    ) -> list[Row]:
+        """Like `list_by_user`, over every document or those of `owner_id`."""
+        stmt = self._listing(
+            limit,
+            after,
+            filename_prefix=filename_prefix,
+            content_type=content_type,
+            created_after=created_after,
+            created_before=created_before,
+            owner_id=owner_id,
+        )
+        result = await session.execute(stmt)
+        return list(result.all())
+
+    @staticmethod
+    def _listing(
+        limit: int,
+        after: tuple[datetime, int] | None,
+        *,
+        filename_prefix: str | None,
+        content_type: str | None,
+        created_after: datetime | None,
+        created_before: datetime | None,
+        owner_id: int | None,
+    ):
+        stmt = (
+            select(*_LISTING_COLUMNS)
+            .order_by(Document.created_at.desc(), Document.id.desc())
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(Document.created_at, Document.id) < tuple_(*after))
+        if filename_prefix:
+            stmt = stmt.where(
+                Document.filename.startswith(filename_prefix, autoescape=True)
+            )
+        if content_type:
+            stmt = stmt.where(Document.content_type == content_type)
+        if created_after:
+            stmt = stmt.where(Document.created_at >= created_after)
+        if created_before:
+            stmt = stmt.where(Document.created_at < created_before)
+        if owner_id is not None:
+            stmt = stmt.where(Document.user_id == owner_id)
+        return stmt
+
+    async def update_status(
+        self, doc_id: int, status: DocumentStatus, error: str | None = None
+    ) -> None:
+        stmt = (
+            update(Document)
+            .where(Document.id == doc_id)
+            .values(status=status, error=error)
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
 
     async def delete(self, doc_id: int) -> None:
         stmt = delete(Document).where(Document.id == doc_id)
@@ -0,0 +1,30 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.models.embedding_cache import EmbeddingCacheEntry
+
+
+class EmbeddingCacheRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        if not keys:
+            return {}
+        stmt = select(EmbeddingCacheEntry.key, EmbeddingCacheEntry.embedding).where(
+            EmbeddingCacheEntry.key.in_(keys)
+        )
+        result = await self.session.execute(stmt)
+        return {key: embedding.tolist() for key, embedding in result.all()}
+
+    async def put_many(self, entries: dict[str, list[float]]) -> None:
+        if not entries:
+            return
+        stmt = (
+            insert(EmbeddingCacheEntry)
+            .values([{"key": k, "embedding": v} for k, v in entries.items()])
+            .on_conflict_do_nothing(index_elements=[EmbeddingCacheEntry.key])
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.domain.models.ingestion_job import IngestionJob, IngestionJobStatus
+
+
+class IngestionJobRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def enqueue(self, document_id: int) -> IngestionJob:
+        job = IngestionJob(
+            document_id=document_id,
+            max_attempts=settings.INGESTION_MAX_ATTEMPTS,
+        )
+        self.session.add(job)
+        await self.session.commit()
+        return job
+
+    async def get_latest_by_document_id(self, document_id: int) -> IngestionJob | None:
+        stmt = (
+            select(IngestionJob)
+            .where(IngestionJob.document_id == document_id)
+            .order_by(IngestionJob.id.desc())
+            .limit(1)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def claim_next(self) -> IngestionJob | None:
+        """
+        Lock the next runnable job and mark it as running.
+
+        Jobs left in RUNNING by a crashed worker are picked up again once
+        their lock is older than INGESTION_JOB_TIMEOUT_SECONDS.
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=settings.INGESTION_JOB_TIMEOUT_SECONDS)
+        stmt = (
+            select(IngestionJob)
+            .where(
+                or_(
+                    and_(
+                        IngestionJob.status == IngestionJobStatus.QUEUED,
+                        IngestionJob.run_after <= now,
+                    ),
+                    and_(
+                        IngestionJob.status == IngestionJobStatus.RUNNING,
+                        IngestionJob.locked_at < stale_before,
+                    ),
+                )
+            )
+            .order_by(IngestionJob.run_after)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(stmt)
+        job = result.scalar_one_or_none()
+        if job is None:
+            await self.session.commit()
+            return None
+
+        job.status = IngestionJobStatus.RUNNING
+        job.attempts += 1
+        job.locked_at = now
+        await self.session.commit()
+        return job
+
+    async def mark_succeeded(self, job_id: int) -> None:
+        stmt = (
+            update(IngestionJob)
+            .where(IngestionJob.id == job_id)
+            .values(
+                status=IngestionJobStatus.SUCCEEDED,
+                last_error=None,
+                locked_at=None,
+                updated_at=datetime.utcnow(),
+            )
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+    async def mark_failed(
+        self, job_id: int, error: str, retry_in: float | None
+    ) -> None:
+        """Requeue the job after `retry_in` seconds, or fail it for good if None."""
+        now = datetime.utcnow()
+        values: dict = {"last_error": error, "locked_at": None, "updated_at": now}
+        if retry_in is None:
+            values["status"] = IngestionJobStatus.FAILED
+        else:
+            values["status"] = IngestionJobStatus.QUEUED
+            values["run_after"] = now + timedelta(seconds=retry_in)
+
+        stmt = update(IngestionJob).where(IngestionJob.id == job_id).values(**values)
+        await self.session.execute(stmt)
+        await self.session.commit()
@@ -1,75 +1,112 @@
-from sqlalchemy import select
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.domain.models.message import Message
+from src.core.database import read_only
+from src.domain.models.chat_session import ChatSession
+from src.domain.models.message import Message, MessageRole
 
 
 class MessageRepository:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_session: AsyncSession | None = None):
         self.session = session
+        self.read_session = read_session
 
-    async def create(self, message: Message) -> Message:
-        self.session.add(message)
+    async def create_many(self, messages: list[Message]) -> None:
+        """
+        Insert messages of one session, and update its `chat_sessions` row,
+        in one transaction without reading them back.
+        """
+        self.session.add_all(messages)
+        await self.session.execute(self._touch_session(messages))
         await self.session.commit()
-        await self.session.refresh(message)
-        return message
 
+    @read_only
     async def get_by_session(
-        self, user_id: int, session_id: str, limit: int = 50
+        self,
+        session: AsyncSession,
+        user_id: int,
+        session_id: str,
+        limit: int = 50,
+        after_id: int | None = None,
     ) -> list[Message]:
-        """Get messages for a specific user session."""
-        stmt = (
-            select(Message)
-            .where(Message.user_id == user_id, Message.session_id == session_id)
-            .order_by(Message.created_at.desc())
-            .limit(limit)
+        """Get the latest messages for a specific user session, after `after_id`."""
+        result = await session.execute(
+            self._latest(user_id, session_id, limit, after_id)
         )
-        result = await self.session.execute(stmt)
         # Return in chronological order
         return list(reversed(result.scalars().all()))
 
-    async def get_sessions_by_user(self, user_id: int) -> list[dict]:
-        """Get all sessions for a user with metadata (last message, timestamp)."""
-        from sqlalchemy import desc, func
-
-        # Subquery to get the last message for each session
-        subquery = (
-            select(
-                Message.session_id,
-                func.max(Message.created_at).label("last_message_time"),
-            )
-            .where(Message.user_id == user_id)
-            .group_by(Message.session_id)
-            .subquery()
+    async def get_latest_by_session(
+        self, user_id: int, session_id: str, limit: int, after_id: int | None = None
+    ) -> list[Message]:
+        """
+        Like `get_by_session`, but always on the primary, so the turn that was
+        just saved is included when building the next one's history.
+        """
+        result = await self.session.execute(
+            self._latest(user_id, session_id, limit, after_id)
         )
+        return list(reversed(result.scalars().all()))
 
-        # Join to get the actual last message content
+    async def get_oldest_by_session(
+        self, user_id: int, session_id: str, limit: int, after_id: int | None = None
+    ) -> list[Message]:
+        """Get the oldest messages of a user session after `after_id`, in order."""
         stmt = (
             select(Message)
-            .join(
-                subquery,
-                (Message.session_id == subquery.c.session_id)
-                & (Message.created_at == subquery.c.last_message_time),
-            )
-            .where(Message.user_id == user_id)
-            .order_by(desc(subquery.c.last_message_time))
+            .where(Message.user_id == user_id, Message.session_id == session_id)
+            .order_by(Message.id)
+            .limit(limit)
         )
-
+        if after_id is not None:
+            stmt = stmt.where(Message.id > after_id)
         result = await self.session.execute(stmt)
-        messages = result.scalars().all()
+        return list(result.scalars().all())
 
-        # Format the response
-        sessions = []
-        for msg in messages:
-            sessions.append(
-                {
-                    "session_id": msg.session_id,
-                    "last_message": msg.content[:100],  # First 100 chars
-                    "timestamp": msg.created_at.isoformat(),
-                    "role": msg.role.value,
-                }
-            )
+    @staticmethod
+    def _latest(user_id: int, session_id: str, limit: int, after_id: int | None):
+        stmt = (
+            select(Message)
+            .where(Message.user_id == user_id, Message.session_id == session_id)
+            .order_by(Message.id.desc())
+            .limit(limit)
+        )
+        if after_id is not None:
+            stmt = stmt.where(Message.id > after_id)
+        return stmt
 
-        return sessions
+    @staticmethod
+    def _touch_session(messages: list[Message]):
+        now = datetime.utcnow()
+        first_prompt = next(
+            (msg.content for msg in messages if msg.role == MessageRole.USER), None
+        )
+        last = messages[-1]
+        stmt = insert(ChatSession).values(
+            user_id=last.user_id,
+            session_id=last.session_id,
+            title=first_prompt[:100] if first_prompt else None,
+            last_message=last.content[:100],
+            last_role=last.role,
+            last_activity=now,
+            message_count=len(messages),
+            created_at=now,
+            updated_at=now,
+        )
+        return stmt.on_conflict_do_update(
+            constraint="uq_chat_sessions_user_id_session_id",
+            set_={
+                "title": func.coalesce(ChatSession.title, stmt.excluded.title),
+                "last_message": stmt.excluded.last_message,
+                "last_role": stmt.excluded.last_role,
+                "last_activity": stmt.excluded.last_activity,
+                "message_count": ChatSession.message_count
+                + stmt.excluded.message_count,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
 
     async def delete_by_session(self, user_id: int, session_id: str) -> bool:
         """Delete all messages for a specific user session."""
@@ -79,5 +116,10 @@ class MessageRepository:
             Message.user_id == user_id, Message.session_id == session_id
         )
         await self.session.execute(stmt)
+        await self.session.execute(
+            delete(ChatSession).where(
+                ChatSession.user_id == user_id, ChatSession.session_id == session_id
+            )
+        )
         await self.session.commit()
         return True
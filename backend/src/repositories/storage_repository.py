@@ -1,11 +1,33 @@
-from typing import BinaryIO
+import asyncio
+import hashlib
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from typing import BinaryIO, Protocol
 
 import aioboto3
+from aiobotocore.config import AioConfig
 
 from src.core.config import settings
 
 
+class AsyncReadable(Protocol):
+    async def read(self, size: int = -1) -> bytes: ...
+
+
+@dataclass
+class UploadResult:
+    size: int
+    content_hash: str
+
+
 class StorageRepository:
+    """
+    S3 access through a single long-lived client.
+
+    The client (and its connection pool) is opened once by `start()`, which
+    the application calls from its lifespan, and shared by every request.
+    """
+
     def __init__(self):
         self.session = aioboto3.Session()
         self.config = {
@@ -13,15 +35,34 @@ class StorageRepository:
             "aws_secret_access_key": settings.AWS_SECRET_ACCESS_KEY,
             "region_name": settings.AWS_REGION,
             "endpoint_url": settings.AWS_ENDPOINT_URL,
+            "config": AioConfig(
+                max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                tcp_keepalive=True,
+                connector_args={"keepalive_timeout": settings.S3_KEEPALIVE_TIMEOUT},
+            ),
         }
         self.bucket = settings.S3_BUCKET_NAME
-        self._initialized = False
+        self._exit_stack = AsyncExitStack()
+        self._client = None
+
+    async def start(self) -> None:
+        self._client = await self._exit_stack.enter_async_context(
+            self.session.client("s3", **self.config)
+        )
+        await self._ensure_bucket(self._client)
+
+    async def close(self) -> None:
+        await self._exit_stack.aclose()
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            raise RuntimeError("StorageRepository.start() has not been called")
+        return self._client
 
     async def _ensure_bucket(self, s3_client):
         """Ensure the bucket exists, especially useful for local MinIO."""
-        if self._initialized:
-            return
-
         try:
             await s3_client.head_bucket(Bucket=self.bucket)
         except Exception:
@@ -29,21 +70,83 @@ class StorageRepository:
                 await s3_client.create_bucket(Bucket=self.bucket)
             else:
                 raise
-        self._initialized = True
 
-    async def upload(self, file_obj: BinaryIO, key: str) -> None:
-        async with self.session.client("s3", **self.config) as s3:
-            await self._ensure_bucket(s3)
-            await s3.upload_fileobj(file_obj, self.bucket, key)
+    async def upload(
+        self, source: AsyncReadable, key: str, content_type: str | None = None
+    ) -> UploadResult:
+        """
+        Stream `source` to S3 without holding the whole file in memory.
+
+        Files larger than S3_MULTIPART_PART_SIZE are sent as a multipart upload
+        with up to S3_UPLOAD_CONCURRENCY parts in flight. Size and SHA-256 are
+        computed while reading.
+        """
+        part_size = settings.S3_MULTIPART_PART_SIZE
+        digest = hashlib.sha256()
+        extra = {"ContentType": content_type} if content_type else {}
+
+        s3 = self.client
+        part = await source.read(part_size)
+        digest.update(part)
+        size = len(part)
+
+        if size < part_size:
+            await s3.put_object(Bucket=self.bucket, Key=key, Body=part, **extra)
+            return UploadResult(size=size, content_hash=digest.hexdigest())
+
+        upload = await s3.create_multipart_upload(Bucket=self.bucket, Key=key, **extra)
+        upload_id = upload["UploadId"]
+        # Each permit is one buffered part, which bounds memory per upload
+        semaphore = asyncio.Semaphore(settings.S3_UPLOAD_CONCURRENCY)
+
+        async def upload_part(number: int, body: bytes) -> dict:
+            try:
+                response = await s3.upload_part(
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=number,
+                    Body=body,
+                )
+                return {"ETag": response["ETag"], "PartNumber": number}
+            finally:
+                semaphore.release()
+
+        tasks: list[asyncio.Task] = []
+        try:
+            while part:
+                await semaphore.acquire()
+                tasks.append(asyncio.create_task(upload_part(len(tasks) + 1, part)))
+                part = await source.read(part_size)
+                digest.update(part)
+                size += len(part)
+
+            parts = await asyncio.gather(*tasks)
+            await s3.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await s3.abort_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id
+            )
+            raise
+
+        return UploadResult(size=size, content_hash=digest.hexdigest())
+
+    async def download_to_file(self, key: str, file_obj: BinaryIO) -> None:
+        await self.client.download_fileobj(self.bucket, key, file_obj)
 
     async def delete(self, key: str) -> None:
-        async with self.session.client("s3", **self.config) as s3:
-            await s3.delete_object(Bucket=self.bucket, Key=key)
+        await self.client.delete_object(Bucket=self.bucket, Key=key)
 
     async def get_presigned_url(self, key: str, expires_in: int = 3600) -> str:
-        async with self.session.client("s3", **self.config) as s3:
-            return await s3.generate_presigned_url(
-                "get_object",
-                Params={"Bucket": self.bucket, "Key": key},
-                ExpiresIn=expires_in,
-            )
+        return await self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=expires_in,
+        )
@@ -1,6 +1,6 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.domain.models.user import User
+from src.domain.models.user import User, UserRole
 
 
 class UserRepository:
@@ -12,6 +12,13 @@ class UserRepository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_status(self, user_id: int) -> tuple[bool, UserRole] | None:
+        """The user's `(is_active, role)`, or None if it does not exist."""
+        stmt = select(User.is_active, User.role).where(User.id == user_id)
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+        return (row.is_active, row.role) if row else None
+
     async def create(self, user: User) -> User:
         self.session.add(user)
         await self.session.commit()
@@ -1,4 +1,4 @@
-from src.core.security import get_password_hash, verify_password
+from src.core.security import get_password_hash_async, verify_password_async
 from src.domain.models.user import User
 from src.domain.schemas.user import UserCreate
 from src.repositories.user_repository import UserRepository
@@ -13,7 +13,7 @@ class AuthService:
         if existing_user:
             raise ValueError("User already exists")
 
-        hashed_pw = get_password_hash(user_in.password)
+        hashed_pw = await get_password_hash_async(user_in.password)
         user = User(email=user_in.email, hashed_password=hashed_pw)
         return await self.user_repo.create(user)
 
@@ -21,6 +21,6 @@ class AuthService:
         user = await self.user_repo.get_by_email(email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             return None
         return user
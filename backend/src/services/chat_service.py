@@ -1,67 +1,277 @@
-from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
+import json
+from dataclasses import replace
+from typing import AsyncIterator
+
+import anyio
+from pydantic_ai import AgentRunResultEvent
+from pydantic_ai.messages import (
+    FunctionToolCallEvent,
+    FunctionToolResultEvent,
+    ModelMessage,
+    ModelMessagesTypeAdapter,
+    ModelRequest,
+    ModelResponse,
+    PartDeltaEvent,
+    PartStartEvent,
+    SystemPromptPart,
+    TextPart,
+    TextPartDelta,
+    UserPromptPart,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.agents.chat_agent.agent import ChatAgent
 from src.agents.chat_agent.deps import ChatDeps
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal, ReadSessionLocal
 from src.domain.models.message import Message, MessageRole
-from src.domain.models.user import User
-from src.repositories.document_chunk_repository import DocumentChunkRepository
+from src.domain.schemas.user import CurrentUser
+from src.repositories.chat_session_repository import ChatSessionRepository
 from src.repositories.message_repository import MessageRepository
+from src.services.chat_summarizer import ChatSummarizer
 from src.services.embedding_service import EmbeddingService
+from src.services.retrieval_cache import RetrievalCache
+from src.services.text_splitter import estimate_tokens
 
 
 class ChatService:
     def __init__(
         self,
         message_repo: MessageRepository,
-        chunk_repo: DocumentChunkRepository,
+        chat_session_repo: ChatSessionRepository,
         embedding_service: EmbeddingService,
         agent: ChatAgent,
+        retrieval_cache: RetrievalCache | None = None,
+        summarizer: ChatSummarizer | None = None,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        read_session_factory: async_sessionmaker[AsyncSession]
+        | None = ReadSessionLocal,
     ):
         self.message_repo = message_repo
-        self.chunk_repo = chunk_repo
+        self.chat_session_repo = chat_session_repo
+        # Tool calls open their own sessions: the model may issue several at
+        # once, and the request session cannot be shared between them
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory
         self.embedding_service = embedding_service
         self.agent = agent
+        self.retrieval_cache = retrieval_cache
+        self.summarizer = summarizer
+
+    async def get_chat_response(
+        self, user: CurrentUser, content: str, session_id: str
+    ) -> str:
+        ai_history, unsummarized = await self._load_history(user, session_id)
+        deps = self._build_deps(user)
+        prompt_saved = await self._save_prompt(user, session_id, content)
+
+        result = await self.agent.run(content, deps=deps, message_history=ai_history)
+
+        await self._save_turn(
+            user,
+            session_id,
+            None if prompt_saved else content,
+            str(result.output),
+            result.new_messages(),
+        )
+        self._maybe_summarize(user, session_id, unsummarized + 2)
+        return str(result.output)
+
+    async def stream_chat_response(
+        self, user: CurrentUser, content: str, session_id: str
+    ) -> AsyncIterator[tuple[str, dict]]:
+        """
+        Run the agent and yield `(event, data)` pairs as the answer is produced:
+        `token` for text deltas, `tool_call`/`tool_result` around tool calls and
+        `done` with the final output.
 
-    async def get_chat_response(self, user: User, content: str, session_id: str) -> str:
-        # 1. Get history from DB for this session
-        history = await self.message_repo.get_by_session(user.id, session_id)
-
-        # 2. Convert to Pydantic AI message history format
-        # Note: This is a simplified conversion. Pydantic AI expects specific types.
-        ai_history = []
-        for msg in history:
-            if msg.role == MessageRole.USER:
-                ai_history.append(
-                    ModelRequest(parts=[UserPromptPart(content=msg.content)])
+        The turn is persisted once the stream ends. If the client goes away
+        mid-answer, whatever text was produced so far is saved; when the run
+        fails only the user message is kept, and only with
+        CHAT_SAVE_USER_MESSAGE_FIRST.
+        """
+        ai_history, unsummarized = await self._load_history(user, session_id)
+        deps = self._build_deps(user)
+        prompt_saved = await self._save_prompt(user, session_id, content)
+
+        output_parts: list[str] = []
+        output: str | None = None
+        new_messages: list[ModelMessage] | None = None
+        failed = False
+        try:
+            async for event in self.agent.run_stream_events(
+                content, deps=deps, message_history=ai_history
+            ):
+                if isinstance(event, PartStartEvent) and isinstance(
+                    event.part, TextPart
+                ):
+                    if event.part.content:
+                        output_parts.append(event.part.content)
+                        yield "token", {"text": event.part.content}
+                elif isinstance(event, PartDeltaEvent) and isinstance(
+                    event.delta, TextPartDelta
+                ):
+                    output_parts.append(event.delta.content_delta)
+                    yield "token", {"text": event.delta.content_delta}
+                elif isinstance(event, FunctionToolCallEvent):
+                    yield (
+                        "tool_call",
+                        {
+                            "tool_call_id": event.part.tool_call_id,
+                            "tool_name": event.part.tool_name,
+                            "args": event.part.args_as_dict(),
+                        },
+                    )
+                elif isinstance(event, FunctionToolResultEvent):
+                    yield (
+                        "tool_result",
+                        {
+                            "tool_call_id": event.result.tool_call_id,
+                            "tool_name": event.result.tool_name,
+                        },
+                    )
+                elif isinstance(event, AgentRunResultEvent):
+                    output = str(event.result.output)
+                    new_messages = event.result.new_messages()
+                    yield "done", {"response": output}
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if output is None:
+                output = "".join(output_parts)
+            if not failed and output:
+                # A client disconnect cancels the response task: shield the write
+                with anyio.CancelScope(shield=True):
+                    await self._save_turn(
+                        user,
+                        session_id,
+                        None if prompt_saved else content,
+                        output,
+                        new_messages,
+                    )
+                self._maybe_summarize(user, session_id, unsummarized + 2)
+
+    async def _load_history(
+        self, user: CurrentUser, session_id: str
+    ) -> tuple[list[ModelMessage], int]:
+        """
+        Pydantic AI history for the next turn, and how many messages are not
+        yet in the session summary.
+
+        Starts with the rolling summary, followed by the newest unsummarized
+        turns that fit in CHAT_HISTORY_MAX_TOKENS.
+        """
+        chat_session = await self.chat_session_repo.get(user.id, session_id)
+        summary = chat_session.summary if chat_session else None
+        history = await self.message_repo.get_latest_by_session(
+            user.id,
+            session_id,
+            limit=settings.CHAT_HISTORY_MAX_MESSAGES,
+            after_id=chat_session.summarized_until if chat_session else None,
+        )
+
+        # Newest turns first, until the token budget runs out
+        budget = settings.CHAT_HISTORY_MAX_TOKENS
+        turns: list[list[ModelMessage]] = []
+        turn: list[ModelMessage] = []
+        for msg in reversed(history):
+            if msg.role == MessageRole.MODEL:
+                if msg.model_messages:
+                    # Already includes the prompt: the user message is skipped
+                    turn = ModelMessagesTypeAdapter.validate_python(msg.model_messages)
+                    budget -= estimate_tokens(json.dumps(msg.model_messages))
+                else:
+                    turn = [ModelResponse(parts=[TextPart(content=msg.content)])]
+                    budget -= estimate_tokens(msg.content)
+                continue
+
+            if not turn or isinstance(turn[0], ModelResponse):
+                turn.insert(
+                    0, ModelRequest(parts=[UserPromptPart(content=msg.content)])
                 )
-            else:
-                ai_history.append(ModelResponse(parts=[TextPart(content=msg.content)]))
+                budget -= estimate_tokens(msg.content)
+            if budget < 0 and turns:
+                break
+            turns.append(turn)
+            turn = []
 
-        # 3. Prepare Deps
-        deps = ChatDeps(
+        ai_history: list[ModelMessage] = []
+        if summary:
+            ai_history.append(
+                ModelRequest(
+                    parts=[
+                        SystemPromptPart(
+                            content=f"Resumen de la conversación anterior:\n{summary}"
+                        )
+                    ]
+                )
+            )
+        for turn in reversed(turns):
+            ai_history.extend(turn)
+        return ai_history, len(history)
+
+    def _build_deps(self, user: CurrentUser) -> ChatDeps:
+        return ChatDeps(
             user=user,
-            chunk_repo=self.chunk_repo,
+            session_factory=self.session_factory,
+            read_session_factory=self.read_session_factory,
             embedding_service=self.embedding_service,
+            retrieval_cache=self.retrieval_cache,
         )
 
-        # 4. Run Agent
-        result = await self.agent.run(content, deps=deps, message_history=ai_history)
+    async def _save_prompt(
+        self, user: CurrentUser, session_id: str, content: str
+    ) -> bool:
+        """Save the user message ahead of the answer, if so configured."""
+        if not settings.CHAT_SAVE_USER_MESSAGE_FIRST:
+            return False
+        await self.message_repo.create_many(
+            [self._user_message(user, session_id, content)]
+        )
+        return True
 
-        # 5. Save messages to DB with session_id
-        user_msg = Message(
+    async def _save_turn(
+        self,
+        user: CurrentUser,
+        session_id: str,
+        content: str | None,
+        output: str,
+        new_messages: list[ModelMessage] | None = None,
+    ) -> None:
+        """Write the turn in one transaction; `content` is None if already saved."""
+        model_msg = Message(
             user_id=user.id,
-            role=MessageRole.USER,
-            content=content,
+            role=MessageRole.MODEL,
+            content=output,
             session_id=session_id,
+            model_messages=self._dump_messages(new_messages) if new_messages else None,
         )
-        model_msg = Message(
+        messages = [model_msg]
+        if content is not None:
+            messages.insert(0, self._user_message(user, session_id, content))
+        await self.message_repo.create_many(messages)
+
+    @staticmethod
+    def _user_message(user: CurrentUser, session_id: str, content: str) -> Message:
+        return Message(
             user_id=user.id,
-            role=MessageRole.MODEL,
-            content=result.output,
+            role=MessageRole.USER,
+            content=content,
             session_id=session_id,
         )
 
-        await self.message_repo.create(user_msg)
-        await self.message_repo.create(model_msg)
+    @staticmethod
+    def _dump_messages(messages: list[ModelMessage]) -> list[dict]:
+        # Instructions are rebuilt on every run; no need to store them per turn
+        messages = [
+            replace(msg, instructions=None) if isinstance(msg, ModelRequest) else msg
+            for msg in messages
+        ]
+        return ModelMessagesTypeAdapter.dump_python(messages, mode="json")
 
-        return str(result.output)
+    def _maybe_summarize(
+        self, user: CurrentUser, session_id: str, unsummarized: int
+    ) -> None:
+        if self.summarizer and unsummarized > settings.CHAT_SUMMARY_TRIGGER_MESSAGES:
+            self.summarizer.schedule(user.id, session_id)
@@ -0,0 +1,91 @@
+import asyncio
+
+import logfire
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.agents.summary_agent.agent import SummaryAgent
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.domain.models.message import MessageRole
+from src.repositories.chat_session_repository import ChatSessionRepository
+from src.repositories.message_repository import MessageRepository
+
+
+class ChatSummarizer:
+    """
+    Compacts chat sessions in the background: once a session has more than
+    CHAT_SUMMARY_TRIGGER_MESSAGES unsummarized messages, all but the last
+    CHAT_SUMMARY_KEEP_MESSAGES are folded into its rolling summary.
+
+    Built once per process; it opens its own sessions since it outlives the
+    request that scheduled it.
+    """
+
+    def __init__(
+        self,
+        agent: SummaryAgent,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+    ):
+        self.agent = agent
+        self.session_factory = session_factory
+        self._tasks: dict[tuple[int, str], asyncio.Task] = {}
+
+    def schedule(self, user_id: int, session_id: str) -> None:
+        key = (user_id, session_id)
+        if key in self._tasks:
+            return
+        task = asyncio.create_task(self._summarize(user_id, session_id))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+
+    async def stop(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def _summarize(self, user_id: int, session_id: str) -> None:
+        try:
+            await self.summarize(user_id, session_id)
+        except Exception:
+            # The next turn schedules it again
+            logfire.exception(
+                "Summarizing chat session {session_id} failed", session_id=session_id
+            )
+
+    async def summarize(self, user_id: int, session_id: str) -> None:
+        window = settings.CHAT_HISTORY_MAX_MESSAGES
+        async with self.session_factory() as session:
+            sessions = ChatSessionRepository(session)
+            chat_session = await sessions.get(user_id, session_id)
+            summary = chat_session.summary if chat_session else None
+            after_id = chat_session.summarized_until if chat_session else None
+
+            # Page forward from the oldest unsummarized message, one window per
+            # summary call, until only the latest ones are left
+            while True:
+                messages = await MessageRepository(session).get_oldest_by_session(
+                    user_id, session_id, limit=window + 1, after_id=after_id
+                )
+                more = len(messages) > window
+                if more:
+                    # More follow: fold the window, up to its last whole turn
+                    messages = messages[:window]
+                    keep = len(messages) - 1
+                else:
+                    if len(messages) <= settings.CHAT_SUMMARY_TRIGGER_MESSAGES:
+                        return
+                    keep = len(messages) - settings.CHAT_SUMMARY_KEEP_MESSAGES
+
+                # Fold whole turns only: the kept messages start with a user message
+                while keep > 0 and messages[keep].role != MessageRole.USER:
+                    keep -= 1
+                if keep == 0:
+                    if not more:
+                        return
+                    # A single turn longer than the window: fold it anyway
+                    keep = len(messages)
+
+                folded = messages[:keep]
+                summary = await self.agent.summarize(summary, folded)
+                after_id = folded[-1].id
+                await sessions.save_summary(user_id, session_id, summary, after_id)
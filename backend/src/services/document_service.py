@@ -1,112 +1,151 @@
+import asyncio
 import uuid
+from datetime import datetime
 
-import fitz
 from fastapi import UploadFile
+from sqlalchemy import Row
 
 from src.core.config import settings
-from src.domain.models.document import Document
-from src.domain.models.document_chunk import DocumentChunk
-from src.domain.models.user import User, UserRole
+from src.domain.models.document import Document, DocumentStatus
+from src.domain.models.user import UserRole
+from src.domain.schemas.document import DocumentListFilters
+from src.domain.schemas.user import CurrentUser
 from src.repositories.document_chunk_repository import DocumentChunkRepository
 from src.repositories.document_repository import DocumentRepository
+from src.repositories.ingestion_job_repository import IngestionJobRepository
 from src.services.embedding_service import EmbeddingService
+from src.services.retrieval_cache import RetrievalCache
 from src.services.storage_service import StorageService
 
 
 class DocumentService:
+    folder = settings.S3_DOCS_FOLDER
+    is_boe = False
+
     def __init__(
         self,
         doc_repo: DocumentRepository,
         chunk_repo: DocumentChunkRepository,
+        job_repo: IngestionJobRepository,
         storage_service: StorageService,
         embedding_service: EmbeddingService,
+        retrieval_cache: RetrievalCache | None = None,
     ):
         self.doc_repo = doc_repo
         self.chunk_repo = chunk_repo
+        self.job_repo = job_repo
         self.storage_service = storage_service
         self.embedding_service = embedding_service
+        self.retrieval_cache = retrieval_cache
+
+    async def upload_document(self, user: CurrentUser, file: UploadFile) -> Document:
+        file_key = f"{self.folder}/{user.id}/{uuid.uuid4()}-{file.filename}"
 
-    async def upload_document(self, user: User, file: UploadFile) -> Document:
-        file_key = f"{settings.S3_DOCS_FOLDER}/{user.id}/{uuid.uuid4()}-{file.filename}"
+        # Streamed straight from the upload spool; size and hash come for free
+        upload = await self.storage_service.upload_file(
+            file, file_key, file.content_type
+        )
 
-        content = await file.read()
-        import io
+        # The user already uploaded these exact bytes
+        existing = await self.doc_repo.get_by_content_hash(upload.content_hash, user.id)
+        if existing:
+            await self.storage_service.delete_file(file_key)
+            return existing
 
-        file_obj = io.BytesIO(content)
-        size = len(content)
+        # Someone else did: reuse their S3 object and, if ready, their chunks
+        source = await self.doc_repo.get_by_content_hash(upload.content_hash)
+        if source:
+            await self.storage_service.delete_file(file_key)
+            file_key = source.file_key
 
-        await self.storage_service.upload_file(file_obj, file_key)
+        reuse_chunks = source is not None and source.status == DocumentStatus.READY
 
         doc = Document(
             user_id=user.id,
             filename=file.filename,
             file_key=file_key,
-            size=size,
+            content_hash=upload.content_hash,
+            size=upload.size,
             content_type=file.content_type,
+            is_boe=self.is_boe,
+            status=DocumentStatus.READY if reuse_chunks else DocumentStatus.PENDING,
         )
-        created_doc = await self.doc_repo.create(doc)
-
-        await self._process_embeddings(created_doc, content, file.content_type or "")
+        created_doc = await self.doc_repo.create_unless_duplicate(doc)
+        if created_doc is None:
+            # A concurrent upload of the same bytes by this user got there first
+            if not source:
+                await self.storage_service.delete_file(file_key)
+            return await self.doc_repo.get_by_content_hash(upload.content_hash, user.id)
+
+        if reuse_chunks:
+            await self.chunk_repo.copy_to_document(source.id, created_doc)
+            if self.retrieval_cache:
+                self.retrieval_cache.invalidate(created_doc.user_id, created_doc.is_boe)
+        else:
+            # Parsing and embedding happen in the ingestion worker
+            await self.job_repo.enqueue(created_doc.id)
 
         return created_doc
 
-    async def _process_embeddings(
-        self, doc: Document, content: bytes, content_type: str
-    ):
-        is_text = content_type and "text" in content_type
-        is_pdf = content_type == "application/pdf"
-
-        if is_text or is_pdf:
-            try:
-                text_content = ""
-                if is_text:
-                    text_content = content.decode("utf-8")
-                elif is_pdf:
-                    doc_pdf = fitz.open(stream=content, filetype="pdf")
-                    for page in doc_pdf:
-                        text_content += page.get_text()
-                    doc_pdf.close()
-
-                if text_content:
-                    chunks = self.embedding_service.split_text(text_content)
-                    if chunks:
-                        embeddings = await self.embedding_service.generate_embeddings(
-                            chunks
-                        )
-
-                        doc_chunks = []
-                        for i, (chunk_text, emb) in enumerate(zip(chunks, embeddings)):
-                            doc_chunks.append(
-                                DocumentChunk(
-                                    document_id=doc.id,
-                                    chunk_index=i,
-                                    content=chunk_text,
-                                    embedding=emb,
-                                )
-                            )
-
-                        await self.chunk_repo.create_many(doc_chunks)
-            except Exception as e:
-                print(f"Error generating embeddings: {e}")
-                pass
-
-    async def get_documents(self, user: User) -> list[Document]:
+    async def get_documents(
+        self,
+        user: CurrentUser,
+        filters: DocumentListFilters,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[Row]:
         if user.role in [UserRole.ADMIN, UserRole.BOE]:
-            return await self.doc_repo.list_all()
-        return await self.doc_repo.list_by_user(user.id)
+            return await self.doc_repo.list_all(limit, after, **filters.model_dump())
+        # Other users only see their own documents: owner_id does not apply
+        return await self.doc_repo.list_by_user(
+            user.id, limit, after, **filters.model_dump(exclude={"owner_id"})
+        )
 
-    async def get_document(self, user: User, doc_id: int):
-        doc = await self.doc_repo.get_by_id(doc_id)
+    async def get_document(self, user: CurrentUser, doc_id: int):
+        doc = await self._get_accessible_document(user, doc_id)
         if not doc:
             return None, None
 
-        if user.role not in [UserRole.ADMIN, UserRole.BOE] and doc.user_id != user.id:
+        url = await self.storage_service.get_presigned_url(doc.file_key, user.id)
+        return doc, url
+
+    async def get_documents_by_ids(
+        self, user: CurrentUser, doc_ids: list[int]
+    ) -> list[tuple[Document, str]]:
+        """Metadata and download URLs for the accessible documents among `doc_ids`."""
+        docs = {doc.id: doc for doc in await self.doc_repo.get_many_by_ids(doc_ids)}
+        accessible = [
+            docs[doc_id]
+            for doc_id in dict.fromkeys(doc_ids)
+            if doc_id in docs and self._can_access(user, docs[doc_id])
+        ]
+        urls = await asyncio.gather(
+            *(
+                self.storage_service.get_presigned_url(doc.file_key, user.id)
+                for doc in accessible
+            )
+        )
+        return list(zip(accessible, urls))
+
+    async def get_document_status(self, user: CurrentUser, doc_id: int):
+        doc = await self._get_accessible_document(user, doc_id)
+        if not doc:
             return None, None
 
-        url = await self.storage_service.get_presigned_url(doc.file_key)
-        return doc, url
+        job = await self.job_repo.get_latest_by_document_id(doc.id)
+        return doc, job
 
-    async def delete_document(self, user: User, doc_id: int):
+    async def _get_accessible_document(self, user: CurrentUser, doc_id: int):
+        doc = await self.doc_repo.get_by_id(doc_id)
+        if not doc or not self._can_access(user, doc):
+            return None
+        return doc
+
+    @staticmethod
+    def _can_access(user: CurrentUser, doc: Document) -> bool:
+        return user.role in [UserRole.ADMIN, UserRole.BOE] or doc.user_id == user.id
+
+    async def delete_document(self, user: CurrentUser, doc_id: int):
         doc = await self.doc_repo.get_by_id(doc_id)
         if not doc:
             return
@@ -114,5 +153,10 @@ class DocumentService:
         if user.role != UserRole.ADMIN and doc.user_id != user.id:
             raise PermissionError("Not allowed")
 
-        await self.storage_service.delete_file(doc.file_key)
         await self.doc_repo.delete(doc_id)
+        if self.retrieval_cache:
+            self.retrieval_cache.invalidate(doc.user_id, doc.is_boe)
+
+        # The object may still back other documents with the same content
+        if await self.doc_repo.count_by_file_key(doc.file_key) == 0:
+            await self.storage_service.delete_file(doc.file_key)
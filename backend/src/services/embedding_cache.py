@@ -0,0 +1,73 @@
+import hashlib
+from array import array
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.repositories.embedding_cache_repository import EmbeddingCacheRepository
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache: an in-process LRU in front of the
+    `embedding_cache` table.
+
+    It opens its own short-lived sessions so it can be shared across requests
+    and the ingestion worker.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        maxsize: int = settings.EMBEDDING_CACHE_LRU_SIZE,
+    ):
+        self.session_factory = session_factory
+        # float32 arrays take ~4x less memory than lists of Python floats
+        self.lru: TTLCache[str, array] = TTLCache(maxsize)
+        self.db_hits = 0
+        self.db_misses = 0
+
+    @staticmethod
+    def make_key(model: str, task_type: str, dimensions: int, text: str) -> str:
+        payload = "\x00".join([model, task_type, str(dimensions), text])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        missing: list[str] = []
+        for key in dict.fromkeys(keys):
+            cached = self.lru.get(key)
+            if cached is not None:
+                found[key] = cached.tolist()
+            else:
+                missing.append(key)
+
+        if missing:
+            async with self.session_factory() as session:
+                stored = await EmbeddingCacheRepository(session).get_many(missing)
+            self.db_hits += len(stored)
+            self.db_misses += len(missing) - len(stored)
+            for key, embedding in stored.items():
+                self.lru.set(key, array("f", embedding))
+            found.update(stored)
+
+        return found
+
+    async def put_many(self, entries: dict[str, list[float]]) -> None:
+        if not entries:
+            return
+        async with self.session_factory() as session:
+            await EmbeddingCacheRepository(session).put_many(entries)
+        for key, embedding in entries.items():
+            self.lru.set(key, array("f", embedding))
+
+    def stats(self) -> dict:
+        db_lookups = self.db_hits + self.db_misses
+        return {
+            "lru": self.lru.stats(),
+            "db_hits": self.db_hits,
+            "db_misses": self.db_misses,
+            "db_hit_rate": self.db_hits / db_lookups if db_lookups else 0.0,
+        }
@@ -1,69 +1,119 @@
+import asyncio
+import random
+
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 
 from src.core.config import settings
+from src.services.embedding_cache import EmbeddingCache
+
+# Rate limiting and transient server errors are worth retrying
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
 
 
 class EmbeddingService:
-    def __init__(self):
-        if not settings.GOOGLE_API_KEY:
-            raise ValueError("GOOGLE_API_KEY is not set")
-        self.client = genai.Client(api_key=settings.GOOGLE_API_KEY)
-        self.model = "gemini-embedding-001"
+    """
+    Gemini embeddings. Built once per process and shared between requests,
+    so the HTTP client, semaphore and cache are common to all callers.
+    """
 
-    def split_text(
-        self, text: str, chunk_size: int = 1000, overlap: int = 200
-    ) -> list[str]:
-        """
-        Simple text splitter with overlap.
-        For production, a more robust tokenizer-aware splitter is recommended,
-        but this serves the purpose without heavy dependencies like langchain.
-        """
-        if not text:
-            return []
-
-        chunks = []
-        start = 0
-        text_len = len(text)
-
-        while start < text_len:
-            end = min(start + chunk_size, text_len)
-            chunks.append(text[start:end])
-            if end == text_len:
-                break
-            start += chunk_size - overlap
-
-        return chunks
+    def __init__(
+        self, client: genai.Client | None = None, cache: EmbeddingCache | None = None
+    ):
+        if client is None:
+            if not settings.GOOGLE_API_KEY:
+                raise ValueError("GOOGLE_API_KEY is not set")
+            client = genai.Client(api_key=settings.GOOGLE_API_KEY)
+        self.client = client
+        self.model = "gemini-embedding-001"
+        self.cache = cache
+        self._semaphore = asyncio.Semaphore(settings.EMBEDDING_MAX_CONCURRENCY)
 
     async def generate_embeddings(
         self, texts: list[str], dimensions: int = 2000
     ) -> list[list[float]]:
-        results = []
-        batch_size = 100
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i : i + batch_size]
-            response = self.client.models.embed_content(
-                model=self.model,
-                contents=batch,
-                config=types.EmbedContentConfig(
-                    task_type="RETRIEVAL_DOCUMENT", output_dimensionality=dimensions
-                ),
+        task_type = "RETRIEVAL_DOCUMENT"
+        if self.cache is None:
+            return await self._embed_batches(texts, task_type, dimensions)
+
+        keys = [
+            self.cache.make_key(self.model, task_type, dimensions, text)
+            for text in texts
+        ]
+        embeddings = await self.cache.get_many(keys)
+
+        # Only unseen texts go to Gemini, each of them once
+        to_embed = {
+            key: text for key, text in zip(keys, texts) if key not in embeddings
+        }
+        if to_embed:
+            fresh = await self._embed_batches(
+                list(to_embed.values()), task_type, dimensions
             )
+            if len(fresh) != len(to_embed):
+                raise ValueError(
+                    f"Expected {len(to_embed)} embeddings, got {len(fresh)}"
+                )
+            new_entries = dict(zip(to_embed.keys(), fresh))
+            await self.cache.put_many(new_entries)
+            embeddings.update(new_entries)
+
+        return [embeddings[key] for key in keys]
+
+    async def _embed_batches(
+        self, texts: list[str], task_type: str, dimensions: int
+    ) -> list[list[float]]:
+        batch_size = settings.EMBEDDING_BATCH_SIZE
+        batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+
+        # Batches are dispatched concurrently, bounded by the semaphore
+        responses = await asyncio.gather(
+            *(self._embed(batch, task_type, dimensions) for batch in batches)
+        )
+
+        results = []
+        for response in responses:
             if response.embeddings:
                 results.extend([e.values for e in response.embeddings if e.values])
-
         return results
 
     async def generate_query_embedding(
         self, text: str, dimensions: int = 2000
     ) -> list[float]:
-        response = self.client.models.embed_content(
-            model=self.model,
-            contents=[text],
-            config=types.EmbedContentConfig(
-                task_type="RETRIEVAL_QUERY", output_dimensionality=dimensions
-            ),
-        )
+        response = await self._embed([text], "RETRIEVAL_QUERY", dimensions)
         if not response.embeddings or not response.embeddings[0].values:
             raise ValueError("Failed to generate embedding")
         return response.embeddings[0].values
+
+    async def _embed(
+        self, contents: list[str], task_type: str, dimensions: int
+    ) -> types.EmbedContentResponse:
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    return await self.client.aio.models.embed_content(
+                        model=self.model,
+                        contents=contents,
+                        config=types.EmbedContentConfig(
+                            task_type=task_type, output_dimensionality=dimensions
+                        ),
+                    )
+            except errors.APIError as e:
+                attempt += 1
+                if (
+                    e.code not in RETRYABLE_STATUS_CODES
+                    or attempt > settings.EMBEDDING_MAX_RETRIES
+                ):
+                    raise
+                # Sleep outside the semaphore so other batches can proceed
+                await asyncio.sleep(self._backoff(attempt))
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        delay = min(
+            settings.EMBEDDING_RETRY_BASE_SECONDS * 2 ** (attempt - 1),
+            settings.EMBEDDING_RETRY_MAX_SECONDS,
+        )
+        # Full jitter avoids retry storms when many batches hit the limit at once
+        return random.uniform(0, delay)
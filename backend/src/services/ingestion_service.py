@@ -0,0 +1,135 @@
+import asyncio
+import tempfile
+from collections import deque
+from contextlib import aclosing
+from typing import AsyncIterator
+
+from src.core.config import settings
+from src.domain.models.document import Document, DocumentStatus
+from src.domain.models.document_chunk import DocumentChunk
+from src.repositories.document_chunk_repository import DocumentChunkRepository
+from src.repositories.document_repository import DocumentRepository
+from src.services.embedding_service import EmbeddingService
+from src.services.pdf_extractor import iter_pdf_pages
+from src.services.retrieval_cache import RetrievalCache
+from src.services.storage_service import StorageService
+from src.services.text_splitter import get_text_splitter
+
+
+class IngestionService:
+    """Turns a stored document into embedded chunks, tracking its status."""
+
+    def __init__(
+        self,
+        doc_repo: DocumentRepository,
+        chunk_repo: DocumentChunkRepository,
+        storage_service: StorageService,
+        embedding_service: EmbeddingService,
+        retrieval_cache: RetrievalCache | None = None,
+    ):
+        self.doc_repo = doc_repo
+        self.chunk_repo = chunk_repo
+        self.storage_service = storage_service
+        self.embedding_service = embedding_service
+        self.retrieval_cache = retrieval_cache
+
+    async def ingest(self, doc_id: int) -> None:
+        doc = await self.doc_repo.get_by_id(doc_id)
+        if not doc:
+            # Deleted while the job was queued, nothing to do
+            return
+
+        content_type = doc.content_type or ""
+        is_text = "text" in content_type
+        is_pdf = content_type == "application/pdf"
+
+        if is_text or is_pdf:
+            await self.doc_repo.update_status(doc.id, DocumentStatus.PARSING)
+            with tempfile.NamedTemporaryFile() as tmp:
+                await self.storage_service.download_to_file(doc.file_key, tmp)
+                tmp.flush()
+
+                pages = iter_pdf_pages(tmp.name) if is_pdf else self._text_pages(tmp)
+                await self.doc_repo.update_status(doc.id, DocumentStatus.EMBEDDING)
+                await self._embed(doc, pages)
+
+        await self.doc_repo.update_status(doc.id, DocumentStatus.READY)
+        if self.retrieval_cache:
+            self.retrieval_cache.invalidate(doc.user_id, doc.is_boe)
+
+    @staticmethod
+    async def _text_pages(file_obj) -> AsyncIterator[tuple[int | None, str]]:
+        file_obj.seek(0)
+        yield None, file_obj.read().decode("utf-8")
+
+    async def _embed(
+        self, doc: Document, pages: AsyncIterator[tuple[int | None, str]]
+    ) -> None:
+        """
+        Split pages into chunks as they arrive and embed them in batches.
+
+        Up to EMBEDDING_MAX_CONCURRENCY embedding batches run concurrently with
+        parsing; finished batches are written in order so chunk_index stays
+        sequential.
+        """
+        # A retried job may have left chunks behind from a previous attempt
+        await self.chunk_repo.delete_by_document_id(doc.id)
+
+        batch_size = settings.EMBEDDING_BATCH_SIZE
+        pending: list[tuple[int | None, str]] = []
+        in_flight: deque[tuple[list[tuple[int | None, str]], asyncio.Task]] = deque()
+        chunk_index = 0
+
+        async def schedule(batch: list[tuple[int | None, str]]) -> None:
+            # Wait for the oldest batch when at capacity, so memory stays flat
+            # when embedding is slower than parsing
+            if len(in_flight) >= settings.EMBEDDING_MAX_CONCURRENCY:
+                await store_head()
+            task = asyncio.create_task(
+                self.embedding_service.generate_embeddings([text for _, text in batch])
+            )
+            in_flight.append((batch, task))
+
+        async def store_head() -> None:
+            nonlocal chunk_index
+            batch, task = in_flight.popleft()
+            embeddings = await task
+            if len(embeddings) != len(batch):
+                raise ValueError(
+                    f"Expected {len(batch)} embeddings, got {len(embeddings)}"
+                )
+
+            doc_chunks = []
+            for (page_number, chunk_text), emb in zip(batch, embeddings):
+                doc_chunks.append(
+                    DocumentChunk(
+                        document_id=doc.id,
+                        user_id=doc.user_id,
+                        is_boe=doc.is_boe,
+                        chunk_index=chunk_index,
+                        page_number=page_number,
+                        content=chunk_text,
+                        embedding=emb,
+                    )
+                )
+                chunk_index += 1
+            await self.chunk_repo.create_many(doc_chunks)
+
+        try:
+            chunks = get_text_splitter().split(pages)
+            async with aclosing(pages), aclosing(chunks):
+                async for chunk in chunks:
+                    pending.append(chunk)
+                    if len(pending) >= batch_size:
+                        await schedule(pending)
+                        pending = []
+                    while in_flight and in_flight[0][1].done():
+                        await store_head()
+
+            if pending:
+                await schedule(pending)
+            while in_flight:
+                await store_head()
+        finally:
+            for _, task in in_flight:
+                task.cancel()
@@ -0,0 +1,66 @@
+import math
+import time
+
+from src.core.cache import TTLCache
+from src.core.config import settings
+
+# Accounts and IPs tracked at once; the least recently failing are dropped first
+MAX_TRACKED_KEYS = 100_000
+
+
+class LoginRateLimiter:
+    """
+    Limits failed logins per account and per client IP over a fixed window of
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS, starting at the first failure. Without an
+    IP (no TRUSTED_PROXIES configured) only the account is limited.
+
+    Blocked attempts are rejected before the password is checked, so a burst
+    against one account costs no bcrypt time. A successful login clears the
+    account's failures (not the IP's). Counters live in this process.
+    """
+
+    def __init__(
+        self,
+        max_failures_per_account: int = settings.LOGIN_MAX_FAILURES_PER_ACCOUNT,
+        max_failures_per_ip: int = settings.LOGIN_MAX_FAILURES_PER_IP,
+        window: float = settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+    ):
+        self.max_failures_per_account = max_failures_per_account
+        self.max_failures_per_ip = max_failures_per_ip
+        self.window = window
+        # key -> (window end, failures)
+        self.failures: TTLCache[tuple[str, str], tuple[float, int]] = TTLCache(
+            MAX_TRACKED_KEYS, window
+        )
+        self.blocked = 0
+
+    def retry_after(self, email: str, ip: str | None) -> int | None:
+        """Seconds until `email` may try again from `ip`, or None if allowed."""
+        now = time.monotonic()
+        wait = 0.0
+        for key, limit in self._limits(email, ip):
+            entry = self.failures.get(key)
+            if entry and entry[1] >= limit:
+                wait = max(wait, entry[0] - now)
+        if wait <= 0:
+            return None
+        self.blocked += 1
+        return math.ceil(wait)
+
+    def record_failure(self, email: str, ip: str | None) -> None:
+        now = time.monotonic()
+        for key, _ in self._limits(email, ip):
+            ends_at, count = self.failures.get(key) or (now + self.window, 0)
+            self.failures.set(key, (ends_at, count + 1), ttl=ends_at - now)
+
+    def reset(self, email: str) -> None:
+        self.failures.pop(("account", email.lower()))
+
+    def _limits(self, email: str, ip: str | None) -> list[tuple[tuple[str, str], int]]:
+        limits = [(("account", email.lower()), self.max_failures_per_account)]
+        if ip:
+            limits.append((("ip", ip), self.max_failures_per_ip))
+        return limits
+
+    def stats(self) -> dict:
+        return {"tracked": len(self.failures), "blocked": self.blocked}
@@ -0,0 +1,76 @@
+import asyncio
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import AsyncIterator
+
+import fitz
+
+from src.core.config import settings
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Process pool shared by every extraction in this process."""
+    global _executor
+    if _executor is None:
+        # Forking a process that runs an event loop is unsafe, so use spawn
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PDF_EXTRACTION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+def _count_pages(path: str) -> int:
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+def _extract_pages(path: str, start: int, stop: int) -> list[str]:
+    with fitz.open(path) as doc:
+        return [doc[i].get_text() for i in range(start, stop)]
+
+
+async def iter_pdf_pages(path: str) -> AsyncIterator[tuple[int, str]]:
+    """
+    Yield `(page_number, text)` for every page of the PDF at `path`, in order.
+
+    Pages are parsed in the process pool in ranges of PDF_PAGES_PER_TASK, with
+    at most PDF_EXTRACTION_WORKERS ranges in flight, so callers can start
+    working on early pages while later ones are still being parsed.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+
+    page_count = await loop.run_in_executor(executor, _count_pages, path)
+    step = settings.PDF_PAGES_PER_TASK
+    ranges = (
+        (start, min(start + step, page_count)) for start in range(0, page_count, step)
+    )
+
+    def submit(start: int, stop: int) -> tuple[int, asyncio.Future]:
+        return start, loop.run_in_executor(executor, _extract_pages, path, start, stop)
+
+    in_flight = deque(
+        submit(*r) for r in islice(ranges, settings.PDF_EXTRACTION_WORKERS)
+    )
+    try:
+        while in_flight:
+            start, future = in_flight.popleft()
+            texts = await future
+            in_flight.extend(submit(*r) for r in islice(ranges, 1))
+            for offset, text in enumerate(texts):
+                yield start + offset + 1, text
+    finally:
+        for _, future in in_flight:
+            future.cancel()
@@ -0,0 +1,131 @@
+import math
+from array import array
+
+from src.core.cache import TTLCache
+from src.core.config import settings
+
+# Cached queries compared against each vector-mode lookup, per scope
+MAX_QUERIES_PER_SCOPE = 50
+# Version key of the BOE collection, shared by every user that can read it
+_BOE = "boe"
+
+
+class RetrievalCache:
+    """
+    Two-level cache for the `retrieve_documents` tool:
+
+    - query text -> query embedding, saving the Gemini round trip;
+    - query -> ids of the retrieved chunks. In "vector" retrieval mode a
+      lookup hits when a cached query embedding is at least
+      RETRIEVAL_CACHE_SIMILARITY similar, so rephrased questions are served
+      too. In "hybrid" mode results also depend on the exact words (e.g.
+      "artículo 47.2" vs "artículo 47.3" embed almost identically), so only
+      the same normalized query text hits.
+
+    Results are scoped by retrieval mode and by a per-user (and BOE)
+    document-set version, bumped with `invalidate` whenever chunks are added
+    or removed. Versions live in this process: changes made elsewhere (e.g. a
+    standalone ingestion worker) are picked up when entries expire.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = settings.RETRIEVAL_CACHE_SIZE,
+        ttl: float = settings.RETRIEVAL_CACHE_TTL_SECONDS,
+        similarity: float = settings.RETRIEVAL_CACHE_SIMILARITY,
+    ):
+        self.similarity = similarity
+        self.embeddings: TTLCache[str, array] = TTLCache(maxsize, ttl)
+        # scope -> [(normalized query embedding, chunk ids)]
+        self.results: TTLCache[tuple, list[tuple[array, list[int]]]] = TTLCache(
+            maxsize, ttl
+        )
+        # (scope, normalized query) -> chunk ids, for "hybrid" mode
+        self.text_results: TTLCache[tuple, list[int]] = TTLCache(maxsize, ttl)
+        self._versions: dict[int | str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_query_embedding(self, query: str) -> list[float] | None:
+        embedding = self.embeddings.get(query)
+        return embedding.tolist() if embedding is not None else None
+
+    def set_query_embedding(self, query: str, embedding: list[float]) -> None:
+        self.embeddings.set(query, array("f", embedding))
+
+    def get_chunk_ids(
+        self,
+        user_id: int,
+        include_boe: bool,
+        mode: str,
+        query: str,
+        embedding: list[float],
+    ) -> list[int] | None:
+        scope = self._scope(user_id, include_boe, mode)
+        chunk_ids = None
+        if mode == "vector":
+            entries = self.results.get(scope)
+            if entries:
+                query_embedding = self._normalize(embedding)
+                similarity, cached_ids = max(
+                    (math.sumprod(cached, query_embedding), chunk_ids)
+                    for cached, chunk_ids in entries
+                )
+                if similarity >= self.similarity:
+                    chunk_ids = cached_ids
+        else:
+            chunk_ids = self.text_results.get((*scope, self._normalize_query(query)))
+
+        if chunk_ids is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return chunk_ids
+
+    def set_chunk_ids(
+        self,
+        user_id: int,
+        include_boe: bool,
+        mode: str,
+        query: str,
+        embedding: list[float],
+        chunk_ids: list[int],
+    ) -> None:
+        scope = self._scope(user_id, include_boe, mode)
+        if mode == "vector":
+            entries = self.results.get(scope) or []
+            entries = [*entries, (self._normalize(embedding), chunk_ids)]
+            self.results.set(scope, entries[-MAX_QUERIES_PER_SCOPE:])
+        else:
+            self.text_results.set((*scope, self._normalize_query(query)), chunk_ids)
+
+    def invalidate(self, user_id: int, is_boe: bool = False) -> None:
+        """Drop cached results over the documents of `user_id` (and BOE's)."""
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        if is_boe:
+            self._versions[_BOE] = self._versions.get(_BOE, 0) + 1
+
+    def _scope(self, user_id: int, include_boe: bool, mode: str) -> tuple:
+        boe_version = self._versions.get(_BOE, 0) if include_boe else None
+        return mode, user_id, include_boe, self._versions.get(user_id, 0), boe_version
+
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    @staticmethod
+    def _normalize(embedding: list[float]) -> array:
+        norm = math.hypot(*embedding) or 1.0
+        return array("f", (x / norm for x in embedding))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "query_embeddings": self.embeddings.stats(),
+            "results": {
+                "size": len(self.results) + len(self.text_results),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            },
+        }
@@ -1,17 +1,45 @@
 from typing import BinaryIO
 
-from src.repositories.storage_repository import StorageRepository
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.repositories.storage_repository import (
+    AsyncReadable,
+    StorageRepository,
+    UploadResult,
+)
 
 
 class StorageService:
-    def __init__(self, repo: StorageRepository):
+    def __init__(
+        self,
+        repo: StorageRepository,
+        url_cache: TTLCache[tuple[str, int | None], str] | None = None,
+    ):
         self.repo = repo
+        self.url_cache = url_cache
 
-    async def upload_file(self, file_obj: BinaryIO, key: str) -> None:
-        await self.repo.upload(file_obj, key)
+    async def upload_file(
+        self, source: AsyncReadable, key: str, content_type: str | None = None
+    ) -> UploadResult:
+        return await self.repo.upload(source, key, content_type)
+
+    async def download_to_file(self, key: str, file_obj: BinaryIO) -> None:
+        await self.repo.download_to_file(key, file_obj)
 
     async def delete_file(self, key: str) -> None:
         await self.repo.delete(key)
 
-    async def get_presigned_url(self, key: str) -> str:
-        return await self.repo.get_presigned_url(key)
+    async def get_presigned_url(self, key: str, user_id: int | None = None) -> str:
+        cache_key = (key, user_id)
+        if self.url_cache is not None:
+            url = self.url_cache.get(cache_key)
+            if url:
+                return url
+
+        expires_in = settings.PRESIGNED_URL_EXPIRES_IN
+        url = await self.repo.get_presigned_url(key, expires_in=expires_in)
+        if self.url_cache is not None:
+            self.url_cache.set(
+                cache_key, url, ttl=expires_in - settings.PRESIGNED_URL_CACHE_MARGIN
+            )
+        return url
@@ -0,0 +1,201 @@
+import re
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Iterator
+
+from src.core.config import settings
+
+Page = tuple[int | None, str]
+
+# Headings of Spanish legislation as laid out by the BOE. Case-sensitive on
+# purpose: body text wrapped at "artículo 5 de la Ley..." is not a heading.
+BOE_HEADING = re.compile(
+    r"^(?:"
+    r"(?:LIBRO|Libro|T[ÍI]TULO|Título|CAP[ÍI]TULO|Capítulo)\s+"
+    r"(?:[IVXLC]+|\d+|PRELIMINAR|Preliminar)\b"
+    r"|Secci[óo]n\s+\d+\.ª"
+    r"|Art[íi]culo\s+(?:\d+(?:\s+(?:bis|ter|quater))?|[úu]nico)\."
+    r"|Disposici[óo]n\s+(?:adicional|transitoria|derogatoria|final)\b"
+    r"|ANEXO\b"
+    r"|PRE[ÁA]MBULO\b"
+    r")"
+)
+# End of sentence: punctuation, whitespace, then what looks like a new sentence
+SENTENCE_END = re.compile(r"(?<=[.!?;:])\s+(?=[A-ZÁÉÍÓÚÑ¿¡«\"(])")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for budgets."""
+    return (len(text) + 3) // 4
+
+
+class TextSplitter(ABC):
+    """
+    Turns a stream of `(page_number, text)` pages into `(page_number, chunk)`
+    pairs, where page_number is the page the chunk starts on.
+
+    Splitters may carry text over from one page to the next, so use a new
+    instance per document.
+    """
+
+    @abstractmethod
+    def feed(self, page_number: int | None, text: str) -> Iterator[Page]: ...
+
+    def finish(self) -> Iterator[Page]:
+        return iter(())
+
+    async def split(self, pages: AsyncIterator[Page]) -> AsyncIterator[Page]:
+        async for page_number, text in pages:
+            for chunk in self.feed(page_number, text):
+                yield chunk
+        for chunk in self.finish():
+            yield chunk
+
+
+class CharacterTextSplitter(TextSplitter):
+    """Fixed-size character windows with overlap, page by page."""
+
+    def __init__(self, chunk_size: int = 1000, overlap: int = 200):
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+
+    def feed(self, page_number: int | None, text: str) -> Iterator[Page]:
+        start = 0
+        while start < len(text):
+            end = min(start + self.chunk_size, len(text))
+            yield page_number, text[start:end]
+            if end == len(text):
+                break
+            start += self.chunk_size - self.overlap
+
+
+class StructuredTextSplitter(TextSplitter):
+    """
+    Packs whole sentences into chunks of at most `max_tokens`.
+
+    BOE headings (títulos, capítulos, artículos, disposiciones...) start a new
+    chunk unless the current one has fewer than `min_tokens`, and chunks
+    continuing a long section are prefixed with its heading. Consecutive
+    chunks of the same section share up to `overlap_tokens` of trailing
+    sentences. Sentences may span pages.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 400,
+        overlap_tokens: int = 50,
+        min_tokens: int = 50,
+        count_tokens=estimate_tokens,
+    ):
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.min_tokens = min_tokens
+        self.count_tokens = count_tokens
+        self._heading: str | None = None
+        # Sentences of the chunk being built: (page_number, text, tokens)
+        self._sentences: list[tuple[int | None, str, int]] = []
+        self._tokens = 0
+        # Whether the chunk continues a section started in an earlier one
+        self._continued = False
+        # Text after the last sentence boundary, and the page it started on
+        self._tail = ""
+        self._tail_page: int | None = None
+
+    def feed(self, page_number: int | None, text: str) -> Iterator[Page]:
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                # Paragraph break
+                yield from self._end_tail()
+                continue
+
+            if BOE_HEADING.match(line):
+                yield from self._end_tail()
+                # Too short to stand alone (e.g. "TÍTULO I" and its name)
+                if self._tokens >= self.min_tokens:
+                    yield from self._end_section()
+                self._heading = line[:200]
+
+            if not self._tail:
+                self._tail, self._tail_page = line, page_number
+            elif self._tail.endswith("-") and self._tail[-2:-1].isalpha():
+                # Word hyphenated at the end of the line
+                self._tail = self._tail[:-1] + line
+            else:
+                self._tail = f"{self._tail} {line}"
+
+            *sentences, self._tail = SENTENCE_END.split(self._tail)
+            for sentence in sentences:
+                yield from self._add(self._tail_page, sentence)
+            if sentences:
+                self._tail_page = page_number
+
+    def finish(self) -> Iterator[Page]:
+        yield from self._end_section()
+
+    def _end_tail(self) -> Iterator[Page]:
+        if self._tail:
+            yield from self._add(self._tail_page, self._tail)
+            self._tail = ""
+
+    def _end_section(self) -> Iterator[Page]:
+        yield from self._end_tail()
+        if self._sentences:
+            yield self._emit()
+        self._sentences, self._tokens = [], 0
+        self._heading = None
+        self._continued = False
+
+    def _add(self, page_number: int | None, sentence: str) -> Iterator[Page]:
+        tokens = self.count_tokens(sentence)
+        if tokens > self.max_tokens:
+            # No boundary to respect: fall back to splitting between words
+            for piece in self._split_words(sentence):
+                yield from self._add(page_number, piece)
+            return
+
+        if self._sentences and self._tokens + tokens > self.max_tokens:
+            yield self._emit()
+            self._start_continuation(tokens)
+        self._sentences.append((page_number, sentence, tokens))
+        self._tokens += tokens
+
+    def _emit(self) -> Page:
+        text = " ".join(sentence for _, sentence, _ in self._sentences)
+        if self._continued and self._heading:
+            text = f"{self._heading}\n{text}"
+        return self._sentences[0][0], text
+
+    def _start_continuation(self, next_tokens: int) -> None:
+        """Start the next chunk of the section with the heading and overlap."""
+        heading_tokens = self.count_tokens(self._heading) if self._heading else 0
+        room = self.max_tokens - heading_tokens - next_tokens
+        overlap: list[tuple[int | None, str, int]] = []
+        overlap_tokens = 0
+        for sentence in reversed(self._sentences[1:]):
+            if overlap_tokens + sentence[2] > min(self.overlap_tokens, room):
+                break
+            overlap.insert(0, sentence)
+            overlap_tokens += sentence[2]
+        self._sentences = overlap
+        self._tokens = heading_tokens + overlap_tokens
+        self._continued = True
+
+    def _split_words(self, sentence: str) -> Iterator[str]:
+        piece: list[str] = []
+        for word in sentence.split():
+            if piece and self.count_tokens(" ".join([*piece, word])) > self.max_tokens:
+                yield " ".join(piece)
+                piece = []
+            piece.append(word)
+        if piece:
+            yield " ".join(piece)
+
+
+def get_text_splitter() -> TextSplitter:
+    """A new splitter, as configured by TEXT_SPLITTER, for one document."""
+    if settings.TEXT_SPLITTER == "character":
+        return CharacterTextSplitter()
+    return StructuredTextSplitter(
+        max_tokens=settings.CHUNK_MAX_TOKENS,
+        overlap_tokens=settings.CHUNK_OVERLAP_TOKENS,
+    )
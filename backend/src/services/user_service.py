@@ -1,6 +1,7 @@
 from src.domain.models.user import User, UserRole
 from src.domain.schemas.user import UserResponse
 from src.repositories.user_repository import UserRepository
+from src.services.user_status_cache import UserStatusCache
 
 
 class UserService:
@@ -9,8 +10,11 @@ class UserService:
     Consume el UserRepository para operaciones de base de datos.
     """
 
-    def __init__(self, user_repo: UserRepository):
+    def __init__(
+        self, user_repo: UserRepository, status_cache: UserStatusCache | None = None
+    ):
         self.user_repo = user_repo
+        self.status_cache = status_cache
 
     async def get_user_by_email(self, email: str) -> User | None:
         """
@@ -51,6 +55,19 @@ class UserService:
         """
         return await self.user_repo.create(user)
 
+    def invalidate_user_status(self, user_id: int) -> None:
+        """
+        Descarta el estado (activo y rol) cacheado de un usuario.
+
+        Debe llamarse tras confirmar cualquier cambio de su estado o rol, para
+        que la siguiente petición lo lea de la base de datos.
+
+        Args:
+            user_id: ID del usuario modificado
+        """
+        if self.status_cache is not None:
+            self.status_cache.invalidate(user_id)
+
     async def is_user_active(self, email: str) -> bool:
         """
         Verifica si un usuario está activo.
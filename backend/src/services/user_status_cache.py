@@ -0,0 +1,33 @@
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.domain.models.user import UserRole
+
+
+class UserStatusCache:
+    """
+    Per-user `(is_active, role)` read by `get_current_user` on every request.
+
+    Code that changes a user's active flag or role must call `invalidate` once
+    the change is committed, so the next request in this process reads it
+    from the database. Other API processes keep their entry until it expires,
+    so there a change takes up to `ttl` seconds to apply.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = settings.AUTH_USER_CACHE_SIZE,
+        ttl: float = settings.AUTH_USER_CACHE_TTL_SECONDS,
+    ):
+        self.entries: TTLCache[int, tuple[bool, UserRole]] = TTLCache(maxsize, ttl)
+
+    def get(self, user_id: int) -> tuple[bool, UserRole] | None:
+        return self.entries.get(user_id)
+
+    def set(self, user_id: int, is_active: bool, role: UserRole) -> None:
+        self.entries.set(user_id, (is_active, role))
+
+    def invalidate(self, user_id: int) -> None:
+        self.entries.pop(user_id)
+
+    def stats(self) -> dict:
+        return self.entries.stats()
@@ -0,0 +1,164 @@
+import asyncio
+
+import logfire
+
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.domain.models.document import DocumentStatus
+from src.repositories.document_chunk_repository import DocumentChunkRepository
+from src.repositories.document_repository import DocumentRepository
+from src.repositories.ingestion_job_repository import IngestionJobRepository
+from src.repositories.storage_repository import StorageRepository
+from src.services.embedding_cache import EmbeddingCache
+from src.services.embedding_service import EmbeddingService
+from src.services.ingestion_service import IngestionService
+from src.services.pdf_extractor import shutdown_executor
+from src.services.retrieval_cache import RetrievalCache
+from src.services.storage_service import StorageService
+
+
+class IngestionWorker:
+    """
+    Asyncio consumer of the `ingestion_jobs` table.
+
+    Runs inside the API process (see `lifespan` in main.py) or standalone with
+    `python -m src.workers.ingestion_worker`. Several workers can share the
+    queue safely since jobs are claimed with `FOR UPDATE SKIP LOCKED`.
+    """
+
+    def __init__(
+        self,
+        storage_service: StorageService,
+        embedding_service: EmbeddingService,
+        concurrency: int = settings.INGESTION_WORKER_CONCURRENCY,
+        poll_interval: float = settings.INGESTION_POLL_INTERVAL_SECONDS,
+        retrieval_cache: RetrievalCache | None = None,
+    ):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.storage_service = storage_service
+        self.embedding_service = embedding_service
+        self.retrieval_cache = retrieval_cache
+        self._stopping = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._run()) for _ in range(self.concurrency)
+        ]
+
+    async def wait(self) -> None:
+        await asyncio.gather(*self._tasks)
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logfire.exception("Ingestion worker loop error")
+                processed = False
+
+            if not processed:
+                try:
+                    await asyncio.wait_for(
+                        self._stopping.wait(), timeout=self.poll_interval
+                    )
+                except TimeoutError:
+                    pass
+
+    async def run_once(self) -> bool:
+        """Process a single job. Returns False when the queue is empty."""
+        async with AsyncSessionLocal() as session:
+            job_repo = IngestionJobRepository(session)
+            doc_repo = DocumentRepository(session)
+
+            job = await job_repo.claim_next()
+            if job is None:
+                return False
+
+            job_id, document_id = job.id, job.document_id
+            attempts, max_attempts = job.attempts, job.max_attempts
+
+            if attempts > max_attempts:
+                await self._fail(
+                    job_repo, doc_repo, job_id, document_id, "Too many attempts", None
+                )
+                return True
+
+            service = IngestionService(
+                doc_repo,
+                DocumentChunkRepository(session),
+                self.storage_service,
+                self.embedding_service,
+                self.retrieval_cache,
+            )
+
+            with logfire.span(
+                "Ingesting document {document_id}",
+                document_id=document_id,
+                attempt=attempts,
+            ):
+                try:
+                    await service.ingest(document_id)
+                except Exception as e:
+                    logfire.exception(
+                        "Ingestion of document {document_id} failed",
+                        document_id=document_id,
+                    )
+                    await session.rollback()
+                    retry_in = (
+                        self._backoff(attempts) if attempts < max_attempts else None
+                    )
+                    await self._fail(
+                        job_repo, doc_repo, job_id, document_id, str(e), retry_in
+                    )
+                    return True
+
+            await job_repo.mark_succeeded(job_id)
+            return True
+
+    async def _fail(
+        self,
+        job_repo: IngestionJobRepository,
+        doc_repo: DocumentRepository,
+        job_id: int,
+        document_id: int,
+        error: str,
+        retry_in: float | None,
+    ) -> None:
+        await job_repo.mark_failed(job_id, error, retry_in)
+        status = DocumentStatus.FAILED if retry_in is None else DocumentStatus.PENDING
+        await doc_repo.update_status(document_id, status, error=error)
+
+    @staticmethod
+    def _backoff(attempts: int) -> float:
+        delay = settings.INGESTION_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+        return min(delay, settings.INGESTION_RETRY_MAX_SECONDS)
+
+
+async def main() -> None:
+    storage_repository = StorageRepository()
+    await storage_repository.start()
+
+    cache = EmbeddingCache() if settings.EMBEDDING_CACHE_ENABLED else None
+    worker = IngestionWorker(
+        StorageService(storage_repository), EmbeddingService(cache=cache)
+    )
+    worker.start()
+    try:
+        await worker.wait()
+    finally:
+        await worker.stop()
+        shutdown_executor()
+        await storage_repository.close()
+
+
+if __name__ == "__main__":
+    logfire.configure(token=settings.LOGFIRE_TOKEN)
+    asyncio.run(main())
@@ -0,0 +1,4 @@
+import os
+
+# Settings require it, but no test calls Gemini
+os.environ.setdefault("GOOGLE_API_KEY", "test")
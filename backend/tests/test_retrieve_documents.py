@@ -0,0 +1,61 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.agents.chat_agent import tools
+from src.agents.chat_agent.deps import ChatDeps
+from src.domain.models.user import UserRole
+from src.domain.schemas.user import CurrentUser
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+class FakeEmbeddingService:
+    async def generate_query_embedding(self, query: str) -> list[float]:
+        return [1.0]
+
+
+def test_concurrent_calls_overlap(monkeypatch):
+    running = 0
+    peak = 0
+
+    class FakeChunkRepository:
+        def __init__(self, session, read_session=None):
+            pass
+
+        async def search_similar(self, embedding, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return [SimpleNamespace(id=1, content="fragmento")]
+
+        async def hybrid_search(self, embedding, query, **kwargs):
+            return await self.search_similar(embedding, **kwargs)
+
+    monkeypatch.setattr(tools, "DocumentChunkRepository", FakeChunkRepository)
+    deps = ChatDeps(
+        user=CurrentUser(
+            id=1, email="user@example.com", role=UserRole.USER, is_active=True
+        ),
+        session_factory=FakeSession,
+        embedding_service=FakeEmbeddingService(),
+    )
+    ctx = SimpleNamespace(deps=deps)
+
+    async def run_all():
+        return await asyncio.gather(
+            *(tools.retrieve_documents(ctx, f"consulta {i}") for i in range(5))
+        )
+
+    results = asyncio.run(run_all())
+
+    assert all("fragmento" in result for result in results)
+    # Each call opens its own session, so the searches run at the same time
+    assert peak == 5
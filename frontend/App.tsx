@@ -4,7 +4,7 @@ import { ChatArea } from './components/ChatArea';
 import { LoginScreen } from './components/LoginScreen';
 import { SourceDocument, Message, MessageRole, AppScreen } from './types';
 import { authService, UserInfo } from './services/auth';
-import { documentService } from './services/documents';
+import { documentService, DocumentFilters } from './services/documents';
 import { chatService } from './services/chat';
 import { setOnUnauthorized } from './services/api';
 import { ThemeProvider } from './components/ThemeContext';
@@ -12,6 +12,8 @@ import { ThemeProvider } from './components/ThemeContext';
 export default function App() {
   const [currentScreen, setCurrentScreen] = useState<AppScreen>(AppScreen.Login);
   const [sources, setSources] = useState<SourceDocument[]>([]);
+  const [sourceFilters, setSourceFilters] = useState<DocumentFilters>({});
+  const [sourcesCursor, setSourcesCursor] = useState<string | null>(null);
   const [currentSessionId, setCurrentSessionId] = useState<string | null>(() => {
     // Try to load session from localStorage
     return localStorage.getItem('currentSessionId');
@@ -60,10 +62,11 @@ export default function App() {
     }
   };
 
-  const loadDocuments = async () => {
+  const loadDocuments = async (filters: DocumentFilters = sourceFilters) => {
     try {
-      const docs = await documentService.getDocuments();
-      setSources(docs);
+      const { documents, nextCursor } = await documentService.getDocuments(filters);
+      setSources(documents);
+      setSourcesCursor(nextCursor);
     } catch (error) {
       console.error('Failed to load documents:', error);
       // If unauthorized, might want to redirect to login
@@ -73,6 +76,22 @@ export default function App() {
     }
   };
 
+  const loadMoreDocuments = async () => {
+    if (!sourcesCursor) return;
+    try {
+      const { documents, nextCursor } = await documentService.getDocuments(sourceFilters, sourcesCursor);
+      setSources(prev => [...prev, ...documents]);
+      setSourcesCursor(nextCursor);
+    } catch (error) {
+      console.error('Failed to load documents:', error);
+    }
+  };
+
+  const handleFilterSources = (filters: DocumentFilters) => {
+    setSourceFilters(filters);
+    loadDocuments(filters);
+  };
+
   const handleDocumentUploaded = (doc: SourceDocument) => {
     setSources(prev => [...prev, doc]);
   };
@@ -84,6 +103,8 @@ export default function App() {
   const handleLogout = () => {
     authService.logout();
     setSources([]);
+    setSourceFilters({});
+    setSourcesCursor(null);
     setCurrentSessionId(null);
     setMessages([]);
     setCurrentUser(null);
@@ -132,6 +153,9 @@ export default function App() {
         <div className="flex h-screen bg-gray-50 dark:bg-gray-900 overflow-hidden font-sans transition-colors duration-200">
           <Sidebar
             sources={sources}
+            hasMoreSources={sourcesCursor !== null}
+            onLoadMoreSources={loadMoreDocuments}
+            onFilterSources={handleFilterSources}
             onUpload={handleDocumentUploaded}
             onDeleteSource={handleDeleteSource}
             currentSessionId={currentSessionId}
@@ -5,13 +5,16 @@ import { SourceDocument, ChatSession } from '../types';
 import { Button } from './Button';
 import { ConfirmationModal } from './ConfirmationModal';
 import { SourceCard } from './SourceCard';
-import { documentService } from '../services/documents';
+import { documentService, DocumentFilters } from '../services/documents';
 import { chatService } from '../services/chat';
 import { SettingsMenu } from './SettingsMenu';
 import { useTranslation } from 'react-i18next';
 
 interface SidebarProps {
   sources: SourceDocument[];
+  hasMoreSources?: boolean;
+  onLoadMoreSources?: () => void;
+  onFilterSources?: (filters: DocumentFilters) => void;
   onUpload?: (doc: SourceDocument) => void;
   onDeleteSource?: (sourceId: string) => void;
   currentSessionId: string | null;
@@ -19,10 +22,13 @@ interface SidebarProps {
   onLogout: () => void;
 }
 
-export const Sidebar: React.FC<SidebarProps> = ({ sources, onUpload, onDeleteSource, currentSessionId, onSessionSelect, onLogout }) => {
+export const Sidebar: React.FC<SidebarProps> = ({ sources, hasMoreSources, onLoadMoreSources, onFilterSources, onUpload, onDeleteSource, currentSessionId, onSessionSelect, onLogout }) => {
   const { t } = useTranslation();
   const fileInputRef = useRef<HTMLInputElement>(null);
   const [sessions, setSessions] = useState<ChatSession[]>([]);
+  const [sessionsCursor, setSessionsCursor] = useState<string | null>(null);
+  const [showSourceFilters, setShowSourceFilters] = useState(false);
+  const [sourceFilters, setSourceFilters] = useState<DocumentFilters>({});
   const [showConversations, setShowConversations] = useState(false);
   const [deleteModalOpen, setDeleteModalOpen] = useState(false);
   const [sessionToDelete, setSessionToDelete] = useState<string | null>(null);
@@ -44,8 +50,20 @@ export const Sidebar: React.FC<SidebarProps> = ({ sources, onUpload, onDeleteSou
 
   const loadSessions = async () => {
     try {
-      const userSessions = await chatService.getSessions();
+      const { sessions: userSessions, nextCursor } = await chatService.getSessions();
       setSessions(userSessions);
+      setSessionsCursor(nextCursor);
+    } catch (error) {
+      console.error('Failed to load sessions:', error);
+    }
+  };
+
+  const loadMoreSessions = async () => {
+    if (!sessionsCursor) return;
+    try {
+      const { sessions: userSessions, nextCursor } = await chatService.getSessions(sessionsCursor);
+      setSessions(prev => [...prev, ...userSessions]);
+      setSessionsCursor(nextCursor);
     } catch (error) {
       console.error('Failed to load sessions:', error);
     }
@@ -55,6 +73,11 @@ export const Sidebar: React.FC<SidebarProps> = ({ sources, onUpload, onDeleteSou
     loadSessions();
   }, [currentSessionId]); // Reload when session changes
 
+  const applySourceFilters = (e: React.FormEvent) => {
+    e.preventDefault();
+    onFilterSources?.(sourceFilters);
+  };
+
   const handleSessionClick = (sessionId: string) => {
     if (onSessionSelect) {
       onSessionSelect(sessionId);
@@ -147,9 +170,37 @@ export const Sidebar: React.FC<SidebarProps> = ({ sources, onUpload, onDeleteSou
           <>
             <div className="flex items-center justify-between mb-3 mt-2">
               <h3 className="text-xs font-bold text-gray-400 dark:text-gray-500 uppercase tracking-wider transition-colors">{t('sidebar.sources')} ({sources.length})</h3>
-              <Filter className="w-4 h-4 text-gray-400 hover:text-gray-600 dark:hover:text-gray-300 cursor-pointer transition-colors" />
+              <Filter
+                onClick={() => setShowSourceFilters(!showSourceFilters)}
+                className={`w-4 h-4 cursor-pointer transition-colors ${showSourceFilters ? 'text-teal-600 dark:text-teal-400' : 'text-gray-400 hover:text-gray-600 dark:hover:text-gray-300'}`}
+              />
             </div>
 
+            {showSourceFilters && (
+              <form onSubmit={applySourceFilters} className="flex gap-2 mb-3">
+                <input
+                  type="text"
+                  value={sourceFilters.filenamePrefix ?? ''}
+                  onChange={(e) => setSourceFilters(prev => ({ ...prev, filenamePrefix: e.target.value }))}
+                  placeholder={t('sidebar.filterByName')}
+                  className="flex-1 min-w-0 px-2 py-1 text-sm rounded-md border border-gray-200 dark:border-gray-700 bg-white dark:bg-gray-800 text-gray-900 dark:text-white transition-colors"
+                />
+                <select
+                  value={sourceFilters.contentType ?? ''}
+                  onChange={(e) => {
+                    const filters = { ...sourceFilters, contentType: e.target.value || undefined };
+                    setSourceFilters(filters);
+                    onFilterSources?.(filters);
+                  }}
+                  className="px-2 py-1 text-sm rounded-md border border-gray-200 dark:border-gray-700 bg-white dark:bg-gray-800 text-gray-900 dark:text-white transition-colors"
+                >
+                  <option value="">{t('sidebar.allTypes')}</option>
+                  <option value="application/pdf">PDF</option>
+                  <option value="text/plain">TXT</option>
+                </select>
+              </form>
+            )}
+
             <div className="space-y-1">
               {sources.map(source => (
                 <SourceCard
@@ -158,6 +209,14 @@ export const Sidebar: React.FC<SidebarProps> = ({ sources, onUpload, onDeleteSou
                   onDelete={handleDeleteDocument}
                 />
               ))}
+              {hasMoreSources && (
+                <button
+                  onClick={onLoadMoreSources}
+                  className="w-full py-2 text-xs text-teal-600 dark:text-teal-400 hover:text-teal-700 dark:hover:text-teal-300 font-medium transition-colors"
+                >
+                  {t('sidebar.loadMore')}
+                </button>
+              )}
             </div>
           </>
         ) : (
@@ -207,6 +266,14 @@ export const Sidebar: React.FC<SidebarProps> = ({ sources, onUpload, onDeleteSou
                   {t('sidebar.noConversations')}
                 </p>
               )}
+              {sessionsCursor && (
+                <button
+                  onClick={loadMoreSessions}
+                  className="w-full py-2 text-xs text-teal-600 dark:text-teal-400 hover:text-teal-700 dark:hover:text-teal-300 font-medium transition-colors"
+                >
+                  {t('sidebar.loadMore')}
+                </button>
+              )}
             </div>
           </>
         )}
@@ -21,18 +21,24 @@ export const chatService = {
         };
     },
 
-    getSessions: async (): Promise<ChatSession[]> => {
-        const response = await fetch(`${API_BASE_URL}/chat/sessions`, {
+    // Most recent sessions first; pass nextCursor back to get the next page
+    getSessions: async (cursor?: string | null): Promise<{ sessions: ChatSession[]; nextCursor: string | null }> => {
+        const params = new URLSearchParams();
+        if (cursor) params.set('cursor', cursor);
+        const response = await fetch(`${API_BASE_URL}/chat/sessions?${params}`, {
             method: 'GET',
             headers: getAuthHeaders(),
         });
         const data = await handleResponse(response);
-        return data.map((session: any) => ({
-            id: session.session_id,
-            title: session.last_message,
-            lastMessage: session.last_message,
-            timestamp: new Date(session.timestamp),
-        }));
+        return {
+            sessions: data.map((session: any) => ({
+                id: session.session_id,
+                title: session.title ?? session.last_message,
+                lastMessage: session.last_message,
+                timestamp: new Date(session.timestamp),
+            })),
+            nextCursor: response.headers.get('X-Next-Cursor'),
+        };
     },
 
     getSessionMessages: async (sessionId: string): Promise<any[]> => {
@@ -1,6 +1,14 @@
 import { SourceDocument } from '../types';
 import { API_BASE_URL, getAuthHeaders, handleResponse } from './api';
 
+// Filters applied server-side by GET /documents/
+export interface DocumentFilters {
+    filenamePrefix?: string;
+    contentType?: string;
+    createdAfter?: string;
+    createdBefore?: string;
+}
+
 interface DocumentResponse {
     id: number;
     filename: string;
@@ -24,15 +32,28 @@ const mapDocument = (doc: DocumentResponse): SourceDocument => {
 };
 
 export const documentService = {
-    getDocuments: async (): Promise<SourceDocument[]> => {
-        const response = await fetch(`${API_BASE_URL}/documents/`, {
+    // Newest first; pass nextCursor back, with the same filters, for the next page
+    getDocuments: async (
+        filters: DocumentFilters = {},
+        cursor?: string | null,
+    ): Promise<{ documents: SourceDocument[]; nextCursor: string | null }> => {
+        const params = new URLSearchParams();
+        if (filters.filenamePrefix) params.set('filename_prefix', filters.filenamePrefix);
+        if (filters.contentType) params.set('content_type', filters.contentType);
+        if (filters.createdAfter) params.set('created_after', filters.createdAfter);
+        if (filters.createdBefore) params.set('created_before', filters.createdBefore);
+        if (cursor) params.set('cursor', cursor);
+        const response = await fetch(`${API_BASE_URL}/documents/?${params}`, {
             method: 'GET',
             headers: {
                 ...getAuthHeaders(),
             },
         });
         const docs: DocumentResponse[] = await handleResponse(response);
-        return docs.map(mapDocument);
+        return {
+            documents: docs.map(mapDocument),
+            nextCursor: response.headers.get('X-Next-Cursor'),
+        };
     },
 
     uploadDocument: async (file: File): Promise<SourceDocument> => {